@@ -5,31 +5,248 @@
 # NetworkX
 import networkx
 
+# Bisection
+from bisect import bisect_left, bisect_right
+
+# Collections
+from collections import defaultdict, deque
+
+# Globbing
+import glob
+
+# Hashing
+import hashlib
+
+# Iteration tools
+import itertools
+
+# Multiprocessing
+import multiprocessing
+
+# NumPy
+import numpy
+
 # OS
 import os
 
-# Pandas
-import pandas
-
-# Plotly
-from plotly.offline import plot
-from plotly.graph_objs import Bar, Scatter, Figure, Layout, \
-    Line, Marker, Annotations, Annotation, XAxis, YAxis
+# Temporary files
+import tempfile
 
 # Regular Expressions
 import re
 
+# String interning (Python 2 cannot intern unicode, so skip it there)
+try:
+    from sys import intern
+except ImportError:
+    def intern(string):
+        return string
+
 # JSON
 import json
 
+# Faster JSON parsing, if available...
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Faster path filtering, if available...
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Faster ForceAtlas2 layout, if available...
+try:
+    from fa2 import ForceAtlas2
+except ImportError:
+    ForceAtlas2 = None
+
+# Parallel layout of graph components, if available...
+try:
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+except ImportError:
+    ProcessPoolExecutor = None
+    BrokenProcessPool = None
+
 # Exceptions
 from . import Exceptions
 
+#
+# Functions
+#
+
+
+def _layout_component(graph, layoutalgo):
+    """
+    Internal function to lay out a graph with networkx, or fa2 for
+    ForceAtlas2 when it is installed.  If fa2 fails, as its last
+    release does with networkx 3, spring layout is used instead.  This
+    is not a method so it can be sent to a process pool.
+
+    :param graph: The graph to lay out.
+    :param layoutalgo: 'forceatlas2' or 'spring'.
+    :returns: A dict of node to position.
+    """
+    if layoutalgo == 'forceatlas2':
+        if ForceAtlas2 is None:
+            return networkx.forceatlas2_layout(graph, max_iter=100,
+                                               scaling_ratio=2.0,
+                                               gravity=1.0)
+
+        try:
+            # fa2 only lays out undirected graphs...
+            return ForceAtlas2(verbose=False).forceatlas2_networkx_layout(
+                graph.to_undirected(), pos=None, iterations=100)
+        except (AttributeError, ImportError, TypeError):
+            # fa2 uses networkx functions removed in networkx 3, and
+            # networkx's own ForceAtlas2 is slower than spring layout...
+            pass
+
+    #  return networkx.fruchterman_reingold_layout(graph)
+    return networkx.spring_layout(graph)
+    # return networkx.circular_layout(graph)
+    # return networkx.shell_layout(graph)
+    # return networkx.spectral_layout(graph)
+
 #
 # Classes
 #
 
 
+class _NodeMetadata(dict):
+    """
+    Base class for the metadata of a node, which is a dict.  The
+    subclasses name the node type, so the metadata can be checked with
+    type() instead of looking up its node_type.
+    """
+    __slots__ = ()
+
+
+class _PIDMetadata(_NodeMetadata):
+    """
+    Metadata for a process node, with the keys node_type, pid, parent_id,
+    threads, name, module_path, children, first_seen, calls, api_calls,
+    cmdline.
+    """
+    __slots__ = ()
+
+
+class _HostMetadata(_NodeMetadata):
+    """Metadata for a host node, with the keys node_type, host."""
+    __slots__ = ()
+
+
+class _IPMetadata(_NodeMetadata):
+    """Metadata for an IP address node, with the keys node_type, ip."""
+    __slots__ = ()
+
+
+class _FileMetadata(_NodeMetadata):
+    """Metadata for a file node, with the keys node_type, file."""
+    __slots__ = ()
+
+
+class _URLMetadata(_NodeMetadata):
+    """Metadata for a URL node, with the keys node_type, url."""
+    __slots__ = ()
+
+
+class _RegistryMetadata(_NodeMetadata):
+    """
+    Metadata for a registry path, with the keys node_type, registry, and
+    link to its node in the graph.
+    """
+    __slots__ = ()
+
+
+class _RegistryLinkMetadata(_NodeMetadata):
+    """Metadata for a registry node, with the link to its path."""
+    __slots__ = ()
+
+
+class _SocketMetadata(_NodeMetadata):
+    """
+    Metadata for a socket node, with the keys node_type, socket, protocol,
+    opentime, closetime.
+    """
+    __slots__ = ()
+
+
+class _TCPConnectMetadata(_NodeMetadata):
+    """
+    Metadata for a TCP connect node, with the keys node_type, timestamp, ip,
+    socket, port.
+    """
+    __slots__ = ()
+
+
+class _IPConnectMetadata(_NodeMetadata):
+    """
+    Metadata for an IP connect node, with the keys node_type, ip, port,
+    timestamp.
+    """
+    __slots__ = ()
+
+
+class _ServerConnectMetadata(_NodeMetadata):
+    """
+    Metadata for a server connect node, with the keys node_type, server, port,
+    timestamp.
+    """
+    __slots__ = ()
+
+
+class _FileEventMetadata(_NodeMetadata):
+    """
+    Metadata for a file write, read, or delete node, with the keys node_type,
+    file, timestamp.
+    """
+    __slots__ = ()
+
+
+class _FileCreateMetadata(_NodeMetadata):
+    """
+    Metadata for a file create node, with the keys node_type, file,
+    existedbefore, desiredaccess, createdisposition, fileattribtes, timestamp.
+    """
+    __slots__ = ()
+
+
+class _FileCopyMetadata(_NodeMetadata):
+    """
+    Metadata for a file copy node, with the keys node_type, existingfile,
+    newfile, existedbefore, timestamp.
+    """
+    __slots__ = ()
+
+
+class _FileMoveMetadata(_NodeMetadata):
+    """
+    Metadata for a file move node, with the keys node_type, existingfile,
+    newfile, timestamp.
+    """
+    __slots__ = ()
+
+
+class _RegistryEventMetadata(_NodeMetadata):
+    """
+    Metadata for a registry delete, create, or read node, with the keys
+    node_type, registry, timestamp.
+    """
+    __slots__ = ()
+
+
+class _RegistryWriteMetadata(_NodeMetadata):
+    """
+    Metadata for a registry write node, with the keys node_type, registry,
+    timestamp, buffer.
+    """
+    __slots__ = ()
+
+
 class CuckooJSONReport(object):
     """
     Class to hold Cuckoo-Modified JSON reports.
@@ -48,20 +265,32 @@ class CuckooJSONReport(object):
     graphvizprog = None
     """This is the graphviz program used to generate the layout."""
 
-    nodemetadata = dict()
-    """This is a dict that will hold dicts of metadata for each node."""
+    layoutalgo = None
+    """This is the networkx algorithm used to generate the layout when
+    there is no graphviz program."""
+
+    nodemetadata = None
+    """This is a dict that will hold the metadata for each node."""
 
-    edgemetadata = dict()
+    edgemetadata = None
     """This is a dict of (edge1,edge2) that will hold dicts of metadata
     for each edge."""
 
     rootpid = None
     """This is the pid (Node) on top."""
 
-    ignorepaths = []
+    positioncachedir = os.path.join(os.path.expanduser('~'), '.cache',
+                                    'visualize_logs')
+    """This is the directory where graph layout positions are cached."""
+
+    positioncachesize = 100
+    """This is the most graph layouts kept in the position cache, the
+    least recently written ones are removed first."""
+
+    ignorepaths = None
     """List of regular expressions to ignore in file or registry data."""
 
-    includepaths = []
+    includepaths = None
     """List of regular expressions to include in file or registry data."""
 
     IPProto = {
@@ -92,6 +321,112 @@ class CuckooJSONReport(object):
     """Information available:
     http://lxr.free-electrons.com/source/include/uapi/linux/in.h"""
 
+    _IPProtoTable = tuple(map(IPProto.get, range(256)))
+    """IPProto indexed by protocol number, None where there is no name."""
+
+    RELEVANT_APIS = frozenset([
+        # Processes
+        'CreateProcessInternalW',
+        # Files
+        'NtCreateFile', 'NtWriteFile', 'NtReadFile',
+        'CopyFileW', 'CopyFileA',
+        'DeleteFileW', 'DeleteFileA',
+        'MoveFileW', 'MoveFileA',
+        'MoveFileWithProgressW', 'MoveFileWithProgressA',
+        # Network
+        'gethostbyname', 'socket', 'closesocket', 'connect', 'ConnectEx',
+        'InternetConnectA', 'InternetConnectW',
+        'InternetOpenUrlA', 'InternetOpenUrlW',
+        # Registry
+        'RegSetValueExA', 'RegSetValueExW', 'NtSetValueKey',
+        'RegDeleteValueA', 'RegDeleteValueW', 'NtDeleteKey',
+        'RegCreateKeyExA', 'RegCreateKeyExW', 'NtCreateKey',
+        'RegQueryValueExA', 'RegQueryValueExW', 'NtQueryValueKey'
+        ])
+    """The APIs whose calls are plotted.  Other calls are dropped on load."""
+
+    _HOVERTEXT = {
+        'PID': "PID: {0[pid]}<br>"
+               "Path: {0[module_path]}<br>"
+               "Command Line: {1}<br>"
+               "Parent PID: {0[parent_id]}<br>"
+               "First Seen: {0[first_seen]}",
+        'HOST': "HOST: {0[host]}",
+        'SERVERCONNECT': "Server Connect: {0[server]}<br>"
+                         "Port: {0[port]}<br>"
+                         "Time: {0[timestamp]}",
+        'IPCONNECT': "IP Connect: {0[ip]}<br>"
+                     "Port: {0[port]}<br>"
+                     "Time: {0[timestamp]}",
+        'IP': "IP: {0[ip]}",
+        'SOCKET': "Socket: {0[socket]}<br>"
+                  "Protocol: {0[protocol]}<br>"
+                  "Open Time: {0[opentime]}<br>"
+                  "Close TIme: {0[closetime]}",
+        'TCPCONNECT': "TCP Connect:<br>"
+                      "IP: {0[ip]}<br>"
+                      "Port: {0[port]}<br>"
+                      "Socket: {0[socket]}<br>"
+                      "Time: {0[timestamp]}",
+        'FILE': "File: {0[file]}",
+        'FILECREATE': "File Create: {0[file]}<br>"
+                      "Existed Before: {0[existedbefore]}<br>"
+                      "Desired Access: {0[desiredaccess]}<br>"
+                      "Create Disposition: {0[createdisposition]}<br>"
+                      "File Atributes: {0[fileattribtes]}<br>"
+                      "Time: {0[timestamp]}",
+        'FILEWRITE': "File Write: {0[file]}<br>"
+                     "Time: {0[timestamp]}",
+        'FILECOPY': "File Copy:<br>"
+                    "Existing File: {0[existingfile]}<br>"
+                    "New File: {0[newfile]}<br>"
+                    "Existed Before: {0[existedbefore]}<br>"
+                    "Time: {0[timestamp]}",
+        'FILEDELETE': "File Delete: {0[file]}<br>"
+                      "Time: {0[timestamp]}",
+        'FILEMOVE': "File Move:<br>"
+                    "Existing File: {0[existingfile]}<br>"
+                    "New File: {0[newfile]}<br>"
+                    "Time: {0[timestamp]}",
+        'FILEREAD': "File Read: {0[file]}<br>"
+                    "Time: {0[timestamp]}",
+        'REGISTRY': "Registry: {0[registry]}",
+        'REGISTRYWRITE': "Registry Write: {0[registry]}<br>"
+                         "Buffer: {0[buffer]}<br>"
+                         "Time: {0[timestamp]}",
+        'REGISTRYDELETE': "Registry Delete: {0[registry]}<br>"
+                          "Time: {0[timestamp]}",
+        'REGISTRYCREATE': "Registry Create: {0[registry]}<br>"
+                          "Time: {0[timestamp]}",
+        'REGISTRYREAD': "Registry Read: {0[registry]}<br>"
+                        "Time: {0[timestamp]}",
+        'URL': "URL: {0[url]}"
+        }
+    """Hover text for each node type, filled in from the node metadata.
+    The fields are read as attributes of the metadata, and the PID
+    command line is passed separately since it may be missing."""
+
+    _ANNOTATIONTEXT = {
+        'PID': "{0[name]}<br>PID: {0[pid]}",
+        'HOST': "HOST: {0[host]}",
+        'IP': "IP: {0[ip]}"
+        }
+    """Annotation text for the node types that are annotated."""
+
+    _UNJOINABLE = re.compile(
+        r'\\[1-9]|\(\?\(\d|\(\?P[<=]|\(\?[aiLmsux]+\)')
+    """Matches path expressions that cannot be joined into an
+    alternation: backreferences, conditional group references, named
+    groups and global flags."""
+
+    _markers = None
+    """Plotly markers already built for the plot being generated, by
+    (symbol, size, color)."""
+
+    _lines = None
+    """Plotly lines already built for the plot being generated, by
+    (color, dash)."""
+
     def __init__(self, jsonreportfile=None,
                  jsonreportdict=None,
                  plotnetwork=True,
@@ -136,9 +471,13 @@ class CuckooJSONReport(object):
         :param plotregistrydeletes: Set to False to ignore registry deletes.
         :param plotregistrycreates: Set to False to ignore registry creates.
         :param ignorepaths: A list of regular expressions to ignore for
-            files and registry values.
+            files and registry values.  They are matched ignoring case.
+            Expressions without backreferences, conditional group
+            references, named groups or global inline flags such as
+            (?s) are matched as one alternation.
         :param includepaths: A list of regular expressions to include for
-            files and registry values.  Overrides ignore paths.
+            files and registry values.  Overrides ignore paths, and is
+            matched the same way.
         :returns: An object.
         :rtype: CuckooJSONReport object.
         """
@@ -154,20 +493,48 @@ class CuckooJSONReport(object):
         self.plotregistrydeletes = plotregistrydeletes
         self.plotregistrycreates = plotregistrycreates
 
+        # Per report, so reports do not share metadata or paths...
+        self.nodemetadata = dict()
+        self.edgemetadata = dict()
+        self.ignorepaths = list()
+        self.includepaths = list()
+
         if ignorepaths is not None and isinstance(ignorepaths, list):
             self.ignorepaths = ignorepaths
 
         if includepaths is not None and isinstance(includepaths, list):
             self.includepaths = includepaths
 
+        # Indexes used to link PIDs to the files of their images...
+        self._pid_nodes_by_module = dict()
+        self._file_nodes_by_path = dict()
+
+        # Sequential numbers for event node names...
+        self._event_counter = itertools.count()
+
+        # Nodes and edges waiting to be added to the graph in bulk...
+        self._pending_nodes = list()
+        self._pending_edges = list()
+
+        # The type of every node in the graph...
+        self._ntype = dict()
+
+        # Compile the path filters once...
+        self._ignore_re = self._compile_re(self.ignorepaths)
+        self._include_re = self._compile_re(self.includepaths)
+
         if jsonreportfile is not None:
             if not os.path.exists(jsonreportfile):
                 raise Exceptions.VisualizeLogsInvalidFile(jsonreportfile)
             else:
                 self.jsonreportfile = jsonreportfile
 
-            with open(self.jsonreportfile, 'r') as jsonfile:
-                self.jsonreportdata = json.load(jsonfile)
+            if orjson is not None:
+                with open(self.jsonreportfile, 'rb') as jsonfile:
+                    self.jsonreportdata = orjson.loads(jsonfile.read())
+            else:
+                with open(self.jsonreportfile, 'r') as jsonfile:
+                    self.jsonreportdata = json.load(jsonfile)
         elif jsonreportdict is not None:
             self.jsonreportfile = None
             self.jsonreportdata = jsonreportdict
@@ -192,22 +559,60 @@ class CuckooJSONReport(object):
             # Add registry activity to the graph...
             self._add_registry_activity()
 
-    def _search_re(self, string, expressions):
+    def _compile_re(self, expressions):
+        """
+        Internal function to compile a list of regular expressions
+        into as few case insensitive expressions as possible.  The
+        expressions are joined into one alternation, except for ones
+        with backreferences, conditional group references, named
+        groups or global inline flags, which would change meaning or
+        fail to compile if joined, so those are compiled on their own.
+
+        :param expressions: List of regular expressions.
+        :returns: A list of compiled regular expressions.
+        """
+        joined = [e for e in expressions if not self._UNJOINABLE.search(e)]
+        separate = [e for e in expressions if self._UNJOINABLE.search(e)]
+
+        compiled = []
+        if joined:
+            compiled.append(self._compile_pattern(
+                "|".join("(?:{0})".format(e) for e in joined)))
+        compiled.extend(self._compile_pattern(e) for e in separate)
+
+        return compiled
+
+    def _compile_pattern(self, pattern):
+        """
+        Internal function to compile a case insensitive regular
+        expression.  Uses RE2 when it is installed and supports the
+        expression.
+
+        :param pattern: Regular expression.
+        :returns: A compiled regular expression.
+        """
+        # RE2 matches in linear time, but lacks some features of re...
+        if re2 is not None:
+            try:
+                return re2.compile("(?i)" + pattern)
+            except re2.error:
+                pass
+
+        return re.compile(pattern, re.IGNORECASE)
+
+    def _filtered(self, string):
         """
-        Internal function to check if string is selected
-        by regular expressions in expression list.
+        Internal function to check if string is ignored by the
+        ignore paths and not selected by the include paths.
         Ignores case!
 
         :param string:  String to search.
-        :param expressions: List of regular expressions to search.
-        :returns: True if expressions fire on string, False otherwise.
+        :returns: True if string should be filtered out, False otherwise.
         """
-        for e in expressions:
-            m = re.search(string, e, re.IGNORECASE)
-            if m:
-                return True
+        if not any(r.search(string) for r in self._ignore_re):
+            return False
 
-        return False
+        return not any(r.search(string) for r in self._include_re)
 
     def _add_all_processes(self):
         """
@@ -221,54 +626,70 @@ class CuckooJSONReport(object):
 
         self.rootpid = "PID {0}".format(self._processtree[0]['pid'])
 
-        for process in self._processtree:
-            self._add_processes_recursive(process)
+        self._add_process_tree()
 
         # Add the rest of the metadata...
         self._add_process_metadata()
 
-    def _add_processes_recursive(self, processtreedict):
+    def _add_process_tree(self):
         """
-        Internal function to add processes recursively from
-        a dict representing the JSON process tree.
+        Internal function to add the processes in the JSON process
+        tree, walking it breadth first.  A parent can turn up later in
+        the walk than its child, e.g. in another tree, so the parent
+        edges are added once all of the processes are known.
 
-        :param processtreedict:  A dict of data from the process tree.
         :returns: Nothing.
         """
-        pid = processtreedict['pid']
-        ppid = processtreedict['parent_id']
-        nodename = "PID {0}".format(pid)
-        ppid_node = "PID {0}".format(ppid)
-
-        self.digraph.add_node(nodename,
-                              type='PID',
-                              pid=pid,
-                              parent_id=ppid)
-
-        self.nodemetadata[nodename] = dict()
-        self.nodemetadata[nodename]['node_type'] = 'PID'
-        self.nodemetadata[nodename]['pid'] = pid
-        self.nodemetadata[nodename]['parent_id'] = ppid
-        self.nodemetadata[nodename]['threads'] = processtreedict['threads']
-        # self.nodemetadata[nodename]['environ'] = processtreedict['environ']
-        self.nodemetadata[nodename]['name'] = processtreedict['name']
-        self.nodemetadata[nodename]['module_path'] =\
-            processtreedict['module_path']
-        self.nodemetadata[nodename]['children'] = list()
-
-        if ppid_node not in self.nodemetadata:
-            self.nodemetadata[ppid_node] = dict()
-            self.nodemetadata[ppid_node]['node_type'] = 'PID'
-            self.nodemetadata[ppid_node]['children'] = list()
-            self.nodemetadata[ppid_node]['cmdline'] = ""
-
-        self.nodemetadata[ppid_node]['children'].append(nodename)
-
-        if ppid_node in self.digraph:
-            self.digraph.add_edge(ppid_node, nodename)
-
-        for child in processtreedict['children']:
-            self._add_processes_recursive(child)
+        addednodes = set()
+        parentedges = list()
+        processes = deque(self._processtree)
+
+        while processes:
+            processtreedict = processes.popleft()
+
+            pid = processtreedict['pid']
+            ppid = processtreedict['parent_id']
+            nodename = "PID {0}".format(pid)
+            ppid_node = "PID {0}".format(ppid)
+
+            self._pending_nodes.append((nodename, {'type': 'PID',
+                                                   'pid': pid,
+                                                   'parent_id': ppid}))
+            addednodes.add(nodename)
+
+            # Keep the children of a parent seen before the process...
+            children = list()
+            if nodename in self.nodemetadata:
+                children = self.nodemetadata[nodename]['children']
+
+            self.nodemetadata[nodename] = _PIDMetadata(
+                node_type='PID',
+                pid=pid,
+                parent_id=ppid,
+                threads=processtreedict['threads'],
+                name=processtreedict['name'],
+                module_path=processtreedict['module_path'],
+                children=children)
+            # self.nodemetadata[nodename]['environ'] =\
+            #     processtreedict['environ']
+            self._pid_nodes_by_module.setdefault(
+                processtreedict['module_path'], list()).append(nodename)
+
+            if ppid_node not in self.nodemetadata:
+                self.nodemetadata[ppid_node] = _PIDMetadata(node_type='PID',
+                                                            children=list(),
+                                                            cmdline="")
+
+            self.nodemetadata[ppid_node]['children'].append(nodename)
+            parentedges.append((ppid_node, nodename))
+
+            processes.extend(processtreedict['children'])
+
+        # Link the processes whose parent is in the tree...
+        self._pending_edges.extend(edge for edge in parentedges
+                                   if edge[0] in addednodes)
+
+        self._flush_pending()
 
     def _add_process_metadata(self):
         """
@@ -280,26 +701,30 @@ class CuckooJSONReport(object):
         for process in self._processes:
             nodename = "PID {0}".format(process['process_id'])
             self.nodemetadata[nodename]['first_seen'] = process['first_seen']
-            self.nodemetadata[nodename]['calls'] =\
-                pandas.DataFrame(process['calls'])
-            self.nodemetadata[nodename]['calls']['timestamp'] =\
-                pandas.to_datetime(
-                    self.nodemetadata[nodename]['calls']['timestamp'])
-            self.nodemetadata[nodename]['calls'] =\
-                self.nodemetadata[nodename]['calls'].sort_values(['timestamp'])
-
-            calls = self.nodemetadata[nodename]['calls']
-
-            createprocs = calls[calls['api'] == 'CreateProcessInternalW']
-
-            for i, createproc in createprocs.iterrows():
-                childpid = None
-                cmdline = None
-                for arg in createproc['arguments']:
-                    if arg['name'] == 'ProcessId':
-                        childpid = arg['value']
-                    if arg['name'] == 'CommandLine':
-                        cmdline = arg['value']
+
+            # Keep only the calls that are plotted.  The timestamps have a
+            # fixed width, so they sort as strings...
+            calls = sorted((c for c in process['calls']
+                            if c['api'] in self.RELEVANT_APIS),
+                           key=lambda c: c['timestamp'])
+
+            # Bucket the calls by API, keeping the time order, and map
+            # each call's argument names to values.  The API and argument
+            # names repeat across calls, so intern them...
+            api_calls = defaultdict(list)
+            for call in calls:
+                call['api'] = intern(call['api'])
+                call['args'] = {intern(a['name']): a['value']
+                                for a in call['arguments']}
+                api_calls[call['api']].append(call)
+
+            self.nodemetadata[nodename]['calls'] = calls
+            self.nodemetadata[nodename]['api_calls'] = api_calls
+
+            for createproc in api_calls['CreateProcessInternalW']:
+                args = createproc['args']
+                childpid = args.get('ProcessId')
+                cmdline = args.get('CommandLine')
 
                 if cmdline is None:
                     cmdline = "Not Available"
@@ -315,38 +740,103 @@ class CuckooJSONReport(object):
 
         :returns:  Nothing.
         """
-        metadata = self.nodemetadata.copy()
-        for node in metadata:
-            if metadata[node]['node_type'] == 'PID':
-                if 'calls' in metadata[node]:
-                    calls = metadata[node]['calls']
+        filehandlers = self._file_handlers()
+
+        # Walk each PID's calls once, dispatching on the API...
+        if filehandlers:
+            for node in self._pid_nodes_with_calls():
+                for call in self.nodemetadata[node]['calls']:
+                    handler = filehandlers.get(call['api'])
+                    if handler is not None and call['status']:
+                        handler(node, call)
+
+        # Connect PIDs to files
+        self._connect_file_to_pid()
+
+        self._flush_pending()
+
+    def _file_handlers(self):
+        """
+        Internal function that maps each file API to the function
+        that adds its calls, for the file activity being plotted.
+
+        :returns: A dict of API name to handler function.
+        """
+        filehandlers = dict()
+
+        # Get file creates...
+        if self.plotfilecreates is True:
+            filehandlers['NtCreateFile'] = self._emit_create
+
+        # Get file writes...
+        if self.plotfilewrites is True:
+            filehandlers['NtWriteFile'] = self._emit_write
+
+        # Get file reads...
+        if self.plotfilereads is True:
+            filehandlers['NtReadFile'] = self._emit_read
+
+        # Get file copies...
+        if self.plotfilecopies is True:
+            for api in ('CopyFileW', 'CopyFileA'):
+                filehandlers[api] = self._emit_copy
+
+        # Get file deletes...
+        if self.plotfiledeletes is True:
+            for api in ('DeleteFileW', 'DeleteFileA'):
+                filehandlers[api] = self._emit_delete
+
+        # Get file moves...
+        if self.plotfilemoves is True:
+            for api in ('MoveFileW', 'MoveFileA', 'MoveFileWithProgressW',
+                        'MoveFileWithProgressA'):
+                filehandlers[api] = self._emit_move
+
+        return filehandlers
+
+    def _pid_nodes_with_calls(self):
+        """
+        Internal function to snapshot the PID nodes that have calls,
+        so the graph can grow while they are processed.
 
-                    # Get file creates...
-                    if self.plotfilecreates is True:
-                        self._add_file_creates(node, calls)
+        :returns:  A list of PID node names.
+        """
+        return [node for node, metadata in self.nodemetadata.items()
+                if type(metadata) is _PIDMetadata and
+                'calls' in metadata]
 
-                    # Get file writes...
-                    if self.plotfilewrites is True:
-                        self._add_file_writes(node, calls)
+    def _flush_pending(self):
+        """
+        Internal function that adds the pending nodes and edges
+        to the graph in bulk.
 
-                    # Get file reads...
-                    if self.plotfilereads is True:
-                        self._add_file_reads(node, calls)
+        :returns:  Nothing.
+        """
+        self.digraph.add_nodes_from(self._pending_nodes)
+        self.digraph.add_edges_from(self._pending_edges)
+        for node, data in self._pending_nodes:
+            self._ntype.setdefault(node, data['type'])
+        self._pending_nodes = list()
+        self._pending_edges = list()
 
-                    # Get file copies...
-                    if self.plotfilecopies is True:
-                        self._add_file_copies(node, calls)
+    def _api_calls(self, api_calls, apis):
+        """
+        Internal function to select the successful calls for a set
+        of APIs from calls already bucketed by API.
 
-                    # Get file deletes...
-                    if self.plotfiledeletes is True:
-                        self._add_file_deletes(node, calls)
+        :param api_calls: A dict of API name to a list of the calls
+            for that API.
+        :param apis: A tuple of API names.
+        :returns: A list of the successful calls in time order.
+        """
+        calls = []
+        for api in apis:
+            calls.extend(c for c in api_calls.get(api, ()) if c['status'])
 
-                    # Get file moves...
-                    if self.plotfilemoves is True:
-                        self._add_file_moves(node, calls)
+        if len(apis) > 1:
+            calls.sort(key=lambda c: c['timestamp'])
 
-                    # Connect PIDs to files
-                    self._connect_file_to_pid()
+        return calls
 
     def _connect_file_to_pid(self):
         """
@@ -354,272 +844,196 @@ class CuckooJSONReport(object):
 
         :returns:  Nothing.
         """
-        for node in self.nodemetadata:
-            if (self.nodemetadata[node]['node_type'] == 'PID' and
-                    'module_path' in self.nodemetadata[node]):
-                pidpath = self.nodemetadata[node]['module_path']
-                for linknode in self.nodemetadata:
-                    if self.nodemetadata[linknode]['node_type'] == 'FILE':
-                        filepath = self.nodemetadata[linknode]['file']
-                        if pidpath == filepath:
-                            self.digraph.add_edge(linknode, node)
+        for pidpath, pidnodes in self._pid_nodes_by_module.items():
+            filenodename = self._file_nodes_by_path.get(pidpath)
+            if filenodename is not None:
+                for pidnode in pidnodes:
+                    self._pending_edges.append((filenodename, pidnode))
 
-    def _add_file_moves(self, node, calls):
+    def _emit_move(self, node, filemove):
         """
-        Internal function that adds the file moves in the calls
-        for the PID node.
+        Internal function that adds a file move call for the
+        PID node.
 
         :param node: PID node name.
-        :param calls:  Calls for node.
+        :param filemove:  A successful file move call for node.
         :returns: Nothing.
         """
-        filemoves = calls[((calls['api'] == 'MoveFileW') |
-                          (calls['api'] == 'MoveFileA') |
-                          (calls['api'] == 'MoveFileWithProgressW') |
-                          (calls['api'] == 'MoveFileWithProgressA')) &
-                          (calls['status'] == True)]
-
-        for i, filemove in filemoves.iterrows():
-            existingfilename = None
-            newfilename = None
-            for arg in filemove['arguments']:
-                if arg['name'] == 'ExistingFileName':
-                    existingfilename = arg['value']
-                if arg['name'] == 'NewFileName':
-                    newfilename = arg['value']
-            if newfilename is not None:
-                if (self._search_re(newfilename, self.ignorepaths) and
-                        not self._search_re(newfilename, self.includepaths)):
-                    continue
-
-                newfilenodename = self._add_file(newfilename)
-                existingfilenodename = self._add_file(existingfilename)
-                # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
-                fmnodename = "FILE MOVE {0}".format(nextid)
-                self.nodemetadata[fmnodename] = dict()
-                self.nodemetadata[fmnodename]['existingfile'] =\
-                    existingfilename
-                self.nodemetadata[fmnodename]['newfile'] = newfilename
-                self.nodemetadata[fmnodename]['node_type'] = 'FILEMOVE'
-                self.nodemetadata[fmnodename]['timestamp'] =\
-                    filemove['timestamp']
-                self.digraph.add_node(fmnodename, type='FILEMOVE')
-
-                self.digraph.add_edge(node, fmnodename)
-                self.digraph.add_edge(fmnodename, newfilenodename)
-                self.digraph.add_edge(fmnodename, existingfilenodename)
-
-    def _add_file_copies(self, node, calls):
-        """
-        Internal function that adds the file copies in the calls
-        for the PID node.
+        args = filemove['args']
+        existingfilename = args.get('ExistingFileName')
+        newfilename = args.get('NewFileName')
+        if newfilename is not None:
+            if self._filtered(newfilename):
+                return
+
+            newfilenodename = self._add_file(newfilename)
+            existingfilenodename = self._add_file(existingfilename)
+            # Get a sequential number for the event...
+            nextid = next(self._event_counter)
+            fmnodename = "FILE MOVE {0}".format(nextid)
+            self.nodemetadata[fmnodename] = _FileMoveMetadata(
+                node_type='FILEMOVE',
+                existingfile=existingfilename,
+                newfile=newfilename,
+                timestamp=filemove['timestamp'])
+            self._pending_nodes.append((fmnodename, {'type': 'FILEMOVE'}))
+
+            self._pending_edges.append((node, fmnodename))
+            self._pending_edges.append((fmnodename, newfilenodename))
+            self._pending_edges.append((fmnodename, existingfilenodename))
+
+    def _emit_copy(self, node, filecopy):
+        """
+        Internal function that adds a file copy call for the
+        PID node.
 
         :param node: PID node name.
-        :param calls:  Calls for node.
+        :param filecopy:  A successful file copy call for node.
         :returns: Nothing.
         """
-        filecopies = calls[((calls['api'] == 'CopyFileW') |
-                            (calls['api'] == 'CopyFileA')) &
-                           (calls['status'] == True)]
-
-        for i, filecreate in filecopies.iterrows():
-            existedbefore = None
-            existingfilename = None
-            newfilename = None
-            for arg in filecreate['arguments']:
-                if arg['name'] == 'ExistingFileName':
-                    existingfilename = arg['value']
-                if arg['name'] == 'ExistedBefore':
-                    existedbefore = arg['value']
-                if arg['name'] == 'NewFileName':
-                    newfilename = arg['value']
-            if newfilename is not None:
-                if (self._search_re(newfilename, self.ignorepaths) and
-                        not self._search_re(newfilename, self.includepaths)):
-                    continue
-                if (self._search_re(existingfilename, self.ignorepaths) and
-                    not
-                        self._search_re(existingfilename, self.includepaths)):
-                    continue
-                newfilenodename = self._add_file(newfilename)
-                existingfilenodename = self._add_file(existingfilename)
-                # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
-                fcnodename = "FILE COPY {0}".format(nextid)
-                self.nodemetadata[fcnodename] = dict()
-                self.nodemetadata[fcnodename]['existingfile'] =\
-                    existingfilename
-                self.nodemetadata[fcnodename]['newfile'] = newfilename
-                self.nodemetadata[fcnodename]['node_type'] = 'FILECOPY'
-                self.nodemetadata[fcnodename]['existedbefore'] = existedbefore
-                self.nodemetadata[fcnodename]['timestamp'] =\
-                    filecreate['timestamp']
-                self.digraph.add_node(fcnodename, type='FILECOPY')
-
-                self.digraph.add_edge(node, fcnodename)
-                self.digraph.add_edge(fcnodename, newfilenodename)
-                self.digraph.add_edge(fcnodename, existingfilenodename)
-
-    def _add_file_deletes(self, node, calls):
-        """
-        Internal function that adds the file deletes in the calls
-        for the PID node.
+        args = filecopy['args']
+        existingfilename = args.get('ExistingFileName')
+        existedbefore = args.get('ExistedBefore')
+        newfilename = args.get('NewFileName')
+        if newfilename is not None:
+            if self._filtered(newfilename):
+                return
+            if self._filtered(existingfilename):
+                return
+            newfilenodename = self._add_file(newfilename)
+            existingfilenodename = self._add_file(existingfilename)
+            # Get a sequential number for the event...
+            nextid = next(self._event_counter)
+            fcnodename = "FILE COPY {0}".format(nextid)
+            self.nodemetadata[fcnodename] = _FileCopyMetadata(
+                node_type='FILECOPY',
+                existingfile=existingfilename,
+                newfile=newfilename,
+                existedbefore=existedbefore,
+                timestamp=filecopy['timestamp'])
+            self._pending_nodes.append((fcnodename, {'type': 'FILECOPY'}))
+
+            self._pending_edges.append((node, fcnodename))
+            self._pending_edges.append((fcnodename, newfilenodename))
+            self._pending_edges.append((fcnodename, existingfilenodename))
+
+    def _emit_delete(self, node, filedelete):
+        """
+        Internal function that adds a file delete call for the
+        PID node.
 
         :param node: PID node name.
-        :param calls:  Calls for node.
+        :param filedelete:  A successful file delete call for node.
         :returns: Nothing.
         """
-        filedeletes = calls[((calls['api'] == 'DeleteFileW') |
-                             (calls['api'] == 'DeleteFileA')) &
-                            (calls['status'] == True)]
-
-        for i, filedelete in filedeletes.iterrows():
-            filename = None
-            for arg in filedelete['arguments']:
-                if arg['name'] == 'FileName':
-                    filename = arg['value']
-            if filename is not None:
-                if (self._search_re(filename, self.ignorepaths) and
-                        not self._search_re(filename, self.includepaths)):
-                    continue
-                filenodename = self._add_file(filename)
-                # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
-                fdnodename = "FILE DELETE {0}".format(nextid)
-                self.nodemetadata[fdnodename] = dict()
-                self.nodemetadata[fdnodename]['file'] =\
-                    filename
-                self.nodemetadata[fdnodename]['node_type'] = 'FILEDELETE'
-                self.nodemetadata[fdnodename]['timestamp'] =\
-                    filedelete['timestamp']
-                self.digraph.add_node(fdnodename, type='FILEDELETE')
-
-                self.digraph.add_edge(node, fdnodename)
-                self.digraph.add_edge(fdnodename, filenodename)
-
-    def _add_file_creates(self, node, calls):
-        """
-        Internal function that adds the file creates in the calls
-        for the PID node.
+        args = filedelete['args']
+        filename = args.get('FileName')
+        if filename is not None:
+            if self._filtered(filename):
+                return
+            filenodename = self._add_file(filename)
+            # Get a sequential number for the event...
+            nextid = next(self._event_counter)
+            fdnodename = "FILE DELETE {0}".format(nextid)
+            self.nodemetadata[fdnodename] = _FileEventMetadata(
+                node_type='FILEDELETE',
+                file=filename,
+                timestamp=filedelete['timestamp'])
+            self._pending_nodes.append((fdnodename,
+                                        {'type': 'FILEDELETE'}))
+
+            self._pending_edges.append((node, fdnodename))
+            self._pending_edges.append((fdnodename, filenodename))
+
+    def _emit_create(self, node, filecreate):
+        """
+        Internal function that adds a file create call for the
+        PID node.
 
         :param node: PID node name.
-        :param calls:  Calls for node.
-        :returns: Nothing.
-        """
-        filecreates = calls[(calls['api'] == 'NtCreateFile') &
-                            (calls['status'] == True)]
-
-        for i, filecreate in filecreates.iterrows():
-            filename = None
-            existedbefore = None
-            desiredaccess = None
-            createdisposition = None
-            fileattribtes = None
-            for arg in filecreate['arguments']:
-                if arg['name'] == 'FileName':
-                    filename = arg['value']
-                if arg['name'] == 'ExistedBefore':
-                    existedbefore = arg['value']
-                if arg['name'] == 'DesiredAccess':
-                    desiredaccess = arg['value']
-                if arg['name'] == 'CreateDisposition':
-                    createdisposition = arg['value']
-                if arg['name'] == 'FileAttributes':
-                    fileattribtes = arg['value']
-            if filename is not None:
-                if (self._search_re(filename, self.ignorepaths) and
-                        not self._search_re(filename, self.includepaths)):
-                    continue
-                filenodename = self._add_file(filename)
-                # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
-                fcnodename = "FILE CREATE {0}".format(nextid)
-                self.nodemetadata[fcnodename] = dict()
-                self.nodemetadata[fcnodename]['file'] = filename
-                self.nodemetadata[fcnodename]['node_type'] = 'FILECREATE'
-                self.nodemetadata[fcnodename]['existedbefore'] = existedbefore
-                self.nodemetadata[fcnodename]['desiredaccess'] = desiredaccess
-                self.nodemetadata[fcnodename]['createdisposition'] =\
-                    createdisposition
-                self.nodemetadata[fcnodename]['fileattribtes'] =\
-                    fileattribtes
-                self.nodemetadata[fcnodename]['timestamp'] =\
-                    filecreate['timestamp']
-                self.digraph.add_node(fcnodename, type='FILECREATE')
-
-                self.digraph.add_edge(node, fcnodename)
-                self.digraph.add_edge(fcnodename, filenodename)
-
-    def _add_file_writes(self, node, calls):
-        """
-        Internal function that adds the file writes in the calls for
-        the PID node.
-
-        :param node:  PID node name.
-        :param calls:  Calls for node.
+        :param filecreate:  A successful file create call for node.
         :returns: Nothing.
         """
-        filewrites = calls[(calls['api'] == 'NtWriteFile') &
-                           (calls['status'] == True)]
-
-        for i, filewrite in filewrites.iterrows():
-            filename = None
-            for arg in filewrite['arguments']:
-                if arg['name'] == 'HandleName':
-                    filename = arg['value']
-            if filename is not None:
-                if (self._search_re(filename, self.ignorepaths) and
-                        not self._search_re(filename, self.includepaths)):
-                    continue
-                filenodename = self._add_file(filename)
-                # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
-                fwnodename = "FILE WRITE {0}".format(nextid)
-                self.nodemetadata[fwnodename] = dict()
-                self.nodemetadata[fwnodename]['file'] = filename
-                self.nodemetadata[fwnodename]['node_type'] = 'FILEWRITE'
-                self.nodemetadata[fwnodename]['timestamp'] =\
-                    filewrite['timestamp']
-                self.digraph.add_node(fwnodename, type='FILEWRITE')
+        args = filecreate['args']
+        filename = args.get('FileName')
+        existedbefore = args.get('ExistedBefore')
+        desiredaccess = args.get('DesiredAccess')
+        createdisposition = args.get('CreateDisposition')
+        fileattribtes = args.get('FileAttributes')
+        if filename is not None:
+            if self._filtered(filename):
+                return
+            filenodename = self._add_file(filename)
+            # Get a sequential number for the event...
+            nextid = next(self._event_counter)
+            fcnodename = "FILE CREATE {0}".format(nextid)
+            self.nodemetadata[fcnodename] = _FileCreateMetadata(
+                node_type='FILECREATE',
+                file=filename,
+                existedbefore=existedbefore,
+                desiredaccess=desiredaccess,
+                createdisposition=createdisposition,
+                fileattribtes=fileattribtes,
+                timestamp=filecreate['timestamp'])
+            self._pending_nodes.append((fcnodename,
+                                        {'type': 'FILECREATE'}))
+
+            self._pending_edges.append((node, fcnodename))
+            self._pending_edges.append((fcnodename, filenodename))
+
+    def _emit_write(self, node, filewrite):
+        """
+        Internal function that adds a file write call for the
+        PID node.
 
-                self.digraph.add_edge(node, fwnodename)
-                self.digraph.add_edge(fwnodename, filenodename)
-
-    def _add_file_reads(self, node, calls):
+        :param node: PID node name.
+        :param filewrite:  A successful file write call for node.
+        :returns: Nothing.
         """
-        Internal function that adds the file reads in the calls for
-        the PID node.
+        args = filewrite['args']
+        filename = args.get('HandleName')
+        if filename is not None:
+            if self._filtered(filename):
+                return
+            filenodename = self._add_file(filename)
+            # Get a sequential number for the event...
+            nextid = next(self._event_counter)
+            fwnodename = "FILE WRITE {0}".format(nextid)
+            self.nodemetadata[fwnodename] = _FileEventMetadata(
+                node_type='FILEWRITE',
+                file=filename,
+                timestamp=filewrite['timestamp'])
+            self._pending_nodes.append((fwnodename, {'type': 'FILEWRITE'}))
+
+            self._pending_edges.append((node, fwnodename))
+            self._pending_edges.append((fwnodename, filenodename))
+
+    def _emit_read(self, node, fileread):
+        """
+        Internal function that adds a file read call for the
+        PID node.
 
-        :param node:  PID node name.
-        :param calls:  Calls for node.
+        :param node: PID node name.
+        :param fileread:  A successful file read call for node.
         :returns: Nothing.
         """
-        filereads = calls[(calls['api'] == 'NtReadFile') &
-                          (calls['status'] == True)]
-
-        for i, fileread in filereads.iterrows():
-            filename = None
-            for arg in fileread['arguments']:
-                if arg['name'] == 'HandleName':
-                    filename = arg['value']
-            if filename is not None:
-                if (self._search_re(filename, self.ignorepaths) and
-                        not self._search_re(filename, self.includepaths)):
-                    continue
-                filenodename = self._add_file(filename)
-                # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
-                frnodename = "FILE READ {0}".format(nextid)
-                self.nodemetadata[frnodename] = dict()
-                self.nodemetadata[frnodename]['file'] = filename
-                self.nodemetadata[frnodename]['node_type'] = 'FILEREAD'
-                self.nodemetadata[frnodename]['timestamp'] =\
-                    fileread['timestamp']
-                self.digraph.add_node(frnodename, type='FILEREAD')
-
-                self.digraph.add_edge(node, frnodename)
-                self.digraph.add_edge(frnodename, filenodename)
+        args = fileread['args']
+        filename = args.get('HandleName')
+        if filename is not None:
+            if self._filtered(filename):
+                return
+            filenodename = self._add_file(filename)
+            # Get a sequential number for the event...
+            nextid = next(self._event_counter)
+            frnodename = "FILE READ {0}".format(nextid)
+            self.nodemetadata[frnodename] = _FileEventMetadata(
+                node_type='FILEREAD',
+                file=filename,
+                timestamp=fileread['timestamp'])
+            self._pending_nodes.append((frnodename, {'type': 'FILEREAD'}))
+
+            self._pending_edges.append((node, frnodename))
+            self._pending_edges.append((frnodename, filenodename))
 
     def _add_network_activity(self):
         """
@@ -628,141 +1042,125 @@ class CuckooJSONReport(object):
 
         :returns:  Nothin.
         """
-        self.domains =\
-            pandas.DataFrame(self.jsonreportdata['network']['domains'])
-        self.dns =\
-            pandas.DataFrame(self.jsonreportdata['network']['dns'])
+        # Index the DNS A records by request...
+        self._dns_a_records = dict()
+        for dns in self.jsonreportdata['network']['dns']:
+            ips = self._dns_a_records.setdefault(dns['request'], list())
+            for answer in dns['answers']:
+                if answer['type'] == 'A':
+                    ips.append(answer['data'])
+
+        for node in self._pid_nodes_with_calls():
+            api_calls = self.nodemetadata[node]['api_calls']
 
-        for i, dns in self.dns.iterrows():
-            self.dns.ix[i]['answers'] =\
-                pandas.DataFrame(self.dns.ix[i]['answers'])
+            # Get DNS lookups...
+            self._add_dns_lookups(node, api_calls)
+            # Add socket activity...
+            self._add_sockets(node, api_calls)
+            # Add internet activity outside sockets...
+            self._add_internet(node, api_calls)
 
-        metadata = self.nodemetadata.copy()
-        for node in metadata:
-            if metadata[node]['node_type'] == 'PID':
-                if 'calls' in metadata[node]:
-                    calls = metadata[node]['calls']
+        # Resolve...
+        self._add_resolve_hosts()
 
-                    # Get DNS lookups...
-                    self._add_dns_lookups(node, calls)
-                    # Add socket activity...
-                    self._add_sockets(node, calls)
-                    # Add internet activity outside sockets...
-                    self._add_internet(node, calls)
-                    # Resolve...
-                    self._add_resolve_hosts()
+        self._flush_pending()
 
-    def _add_internet(self, node, calls):
+    def _add_internet(self, node, api_calls):
         """
         Internal function to add internet activity outside
         socket activity.
 
         :param node: The node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls
+        :param api_calls:  A dict of API name to process calls
             for node.
         :returns: Nothing.
         """
-        self._add_internet_url(node, calls)
-        self._add_internet_server_connect(node, calls)
-        self._add_internet_ip_connect(node, calls)
+        self._add_internet_url(node, api_calls)
+        self._add_internet_server_connect(node, api_calls)
+        self._add_internet_ip_connect(node, api_calls)
 
-    def _add_internet_ip_connect(self, node, calls):
+    def _add_internet_ip_connect(self, node, api_calls):
         """
         Internal function to add ip connect activity.
 
         :param node:  The node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls
+        :param api_calls:  A dict of API name to process calls
             for node.
         :returns: Nothing.
         """
-        ips = calls[(calls['api'] == 'ConnectEx')]
-
-        for i, ip in ips.iterrows():
-            destip = None
-
-            for arg in ip['arguments']:
-                if arg['name'] == 'ip':
-                    destip = arg['value']
-                if arg['name'] == 'port':
-                    destport = arg['value']
+        for ip in api_calls.get('ConnectEx', ()):
+            args = ip['args']
+            destip = args.get('ip')
+            destport = args.get('port')
 
             if destip is not None:
                 ipnodename = self._add_ip(destip)
                 # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
                 connnodename = "IP CONNECT {0}".format(nextid)
-                self.nodemetadata[connnodename] = dict()
-                self.nodemetadata[connnodename]['ip'] = destip
-                self.nodemetadata[connnodename]['port'] = destport
-                self.nodemetadata[connnodename]['node_type'] = 'IPCONNECT'
-                self.nodemetadata[connnodename]['timestamp'] =\
-                    ip['timestamp']
-                self.digraph.add_node(connnodename, type='IPCONNECT')
+                self.nodemetadata[connnodename] = _IPConnectMetadata(
+                    node_type='IPCONNECT',
+                    ip=destip,
+                    port=destport,
+                    timestamp=ip['timestamp'])
+                self._pending_nodes.append((connnodename,
+                                            {'type': 'IPCONNECT'}))
 
-                self.digraph.add_edge(node, connnodename)
-                self.digraph.add_edge(connnodename, ipnodename)
+                self._pending_edges.append((node, connnodename))
+                self._pending_edges.append((connnodename, ipnodename))
 
-    def _add_internet_server_connect(self, node, calls):
+    def _add_internet_server_connect(self, node, api_calls):
         """
         Internal function to add internet server connect activity.
 
         :param node:  The node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls
+        :param api_calls:  A dict of API name to process calls
             for node.
         :returns: Nothing.
         """
-        servers = calls[((calls['api'] == 'InternetConnectA') |
-                        (calls['api'] == 'InternetConnectW')) &
-                        (calls['status'] == True)]
+        servers = self._api_calls(api_calls, ('InternetConnectA',
+                                              'InternetConnectW'))
 
-        for i, server in servers.iterrows():
-            destserver = None
-
-            for arg in server['arguments']:
-                if arg['name'] == 'ServerName':
-                    destserver = arg['value']
-                if arg['name'] == 'ServerPort':
-                    destport = arg['value']
+        for server in servers:
+            args = server['args']
+            destserver = args.get('ServerName')
+            destport = args.get('ServerPort')
 
             if destserver is not None:
                 servernodename = self._add_host(destserver)
                 # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
                 connnodename = "SERVER CONNECT {0}".format(nextid)
-                self.nodemetadata[connnodename] = dict()
-                self.nodemetadata[connnodename]['server'] = destserver
-                self.nodemetadata[connnodename]['port'] = destport
-                self.nodemetadata[connnodename]['node_type'] = 'SERVERCONNECT'
-                self.nodemetadata[connnodename]['timestamp'] =\
-                    server['timestamp']
-                self.digraph.add_node(connnodename, type='SERVERCONNECT')
+                self.nodemetadata[connnodename] = _ServerConnectMetadata(
+                    node_type='SERVERCONNECT',
+                    server=destserver,
+                    port=destport,
+                    timestamp=server['timestamp'])
+                self._pending_nodes.append((connnodename,
+                                            {'type': 'SERVERCONNECT'}))
 
-                self.digraph.add_edge(node, connnodename)
-                self.digraph.add_edge(connnodename, servernodename)
+                self._pending_edges.append((node, connnodename))
+                self._pending_edges.append((connnodename, servernodename))
 
-    def _add_internet_url(self, node, calls):
+    def _add_internet_url(self, node, api_calls):
         """
         Internal function to add internet url activity.
 
         :param node:  The node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls
+        :param api_calls:  A dict of API name to process calls
             for node.
         :returns: Nothing.
         """
-        urls = calls[((calls['api'] == 'InternetOpenUrlW') |
-                     (calls['api'] == 'InternetOpenUrlA')) &
-                     (calls['status'] == True)]
-
-        for i, url in urls.iterrows():
-            desturl = None
+        urls = self._api_calls(api_calls, ('InternetOpenUrlW',
+                                           'InternetOpenUrlA'))
 
-            for arg in url['arguments']:
-                if arg['name'] == 'URL':
-                    desturl = arg['value']
+        for url in urls:
+            args = url['args']
+            desturl = args.get('URL')
 
             if desturl is not None:
                 urlnodename = self._add_url(desturl)
-                self.digraph.add_edge(node, urlnodename)
+                self._pending_edges.append((node, urlnodename))
 
     def _add_resolve_hosts(self):
         """
@@ -770,54 +1168,35 @@ class CuckooJSONReport(object):
 
         :returns:  Nothing.
         """
-        digraphcopy = self.digraph.copy()
+        hostnodes = [node for node, metadata in self.nodemetadata.items()
+                     if type(metadata) is _HostMetadata]
 
-        for node in digraphcopy:
-            if digraphcopy.node[node]['type'] == 'HOST':
-                hostname = self.nodemetadata[node]['host']
-                dns = self.dns[self.dns['request'] == hostname]
+        for node in hostnodes:
+            hostname = self.nodemetadata[node]['host']
 
-                for i, d in dns.iterrows():
-                    for j, a in d['answers'].iterrows():
-                        if a['type'] == 'A':
-                            ipnodename = self._add_ip(a['data'])
-                            self.digraph.add_edge(node, ipnodename)
+            for ip in self._dns_a_records.get(hostname, ()):
+                ipnodename = self._add_ip(ip)
+                self._pending_edges.append((node, ipnodename))
 
-    def _add_dns_lookups(self, node, calls):
+    def _add_dns_lookups(self, node, api_calls):
         """
         Internal function to add DNS lookups to the graph.
 
         :param node: The node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls.
+        :param api_calls:  A dict of API name to process calls.
         :returns:  Nothing.
         """
-        dnslookups = calls[calls['api'] == 'gethostbyname']
-
-        for i, lookup in dnslookups.iterrows():
-            hostname = None
-
-            for arg in lookup['arguments']:
-                if arg['name'] == 'Name':
-                    hostname = arg['value']
-                    break
+        for lookup in api_calls.get('gethostbyname', ()):
+            args = lookup['args']
+            hostname = args.get('Name')
 
             if hostname is not None:
                 hostnodename = self._add_host(hostname)
-                self.digraph.add_edge(node, hostnodename)
-
-                dns = self.dns[(self.dns['request'] == hostname)]
-
-                for i, d in dns.iterrows():
-                    for j, a in d['answers'].iterrows():
-                        if a['type'] == 'A':
-                            ipnodename = self._add_ip(a['data'])
-                            self.digraph.add_edge(hostnodename, ipnodename)
+                self._pending_edges.append((node, hostnodename))
 
-                # ips = self.domains[self.domains['domain'] == hostname]
-
-                # for j, ip in ips.iterrows():
-                #     ipnodename = self._add_ip(ip['ip'])
-                #     self.digraph.add_edge(hostnodename, ipnodename)
+                for ip in self._dns_a_records.get(hostname, ()):
+                    ipnodename = self._add_ip(ip)
+                    self._pending_edges.append((hostnodename, ipnodename))
 
     def _add_host(self, host):
         """
@@ -826,12 +1205,11 @@ class CuckooJSONReport(object):
         :param host: Host name.
         :returns: Node name for the host.
         """
-        hostnodename = "HOST {0}".format(host)
+        hostnodename = 'HOST ' + host
         if hostnodename not in self.nodemetadata:
-            self.nodemetadata[hostnodename] = dict()
-            self.nodemetadata[hostnodename]['node_type'] = 'HOST'
-            self.nodemetadata[hostnodename]['host'] = host
-            self.digraph.add_node(hostnodename, type='HOST')
+            self.nodemetadata[hostnodename] = _HostMetadata(node_type='HOST',
+                                                            host=host)
+            self._pending_nodes.append((hostnodename, {'type': 'HOST'}))
 
         return hostnodename
 
@@ -842,12 +1220,10 @@ class CuckooJSONReport(object):
         :param ip: IP address.
         :returns: Node name for the IP address.
         """
-        ipnodename = '"IP {0}"'.format(ip)
+        ipnodename = '"IP ' + ip + '"'
         if ipnodename not in self.nodemetadata:
-            self.nodemetadata[ipnodename] = dict()
-            self.nodemetadata[ipnodename]['node_type'] = 'IP'
-            self.nodemetadata[ipnodename]['ip'] = ip
-            self.digraph.add_node(ipnodename, type='IP')
+            self.nodemetadata[ipnodename] = _IPMetadata(node_type='IP', ip=ip)
+            self._pending_nodes.append((ipnodename, {'type': 'IP'}))
 
         return ipnodename
 
@@ -855,17 +1231,15 @@ class CuckooJSONReport(object):
         """
         Internal function to add a file if it does not exist.
 
-        :param ip: File path.
+        :param filename: File path.
         :returns: Node name for the file.
         """
-        origfilename = filename
-        filename = filename.replace('\\', '\\\\')
-        filenodename = '"FILE {0}"'.format(filename)
+        filenodename = '"FILE ' + filename.replace('\\', '\\\\') + '"'
         if filenodename not in self.nodemetadata:
-            self.nodemetadata[filenodename] = dict()
-            self.nodemetadata[filenodename]['node_type'] = 'FILE'
-            self.nodemetadata[filenodename]['file'] = origfilename
-            self.digraph.add_node(filenodename, type='FILE')
+            self.nodemetadata[filenodename] = _FileMetadata(node_type='FILE',
+                                                            file=filename)
+            self._pending_nodes.append((filenodename, {'type': 'FILE'}))
+            self._file_nodes_by_path[filename] = filenodename
 
         return filenodename
 
@@ -876,19 +1250,17 @@ class CuckooJSONReport(object):
         :param registry:  Registry
         :returns: Node name for the registry.
         """
-        origregistry = registry
-        registry = registry.replace('\\', '\\\\')
-        regnodename = '"REGISTRY {0}"'.format(registry)
+        regnodename = '"REGISTRY ' + registry.replace('\\', '\\\\') + '"'
         if regnodename not in self.nodemetadata:
-            nextid = len(self.nodemetadata)
-            newregnodename = 'REGISTRY {0}'.format(nextid)
-            self.nodemetadata[newregnodename] = dict()
-            self.nodemetadata[newregnodename]['link'] = regnodename
-            self.nodemetadata[regnodename] = dict()
-            self.nodemetadata[regnodename]['node_type'] = 'REGISTRY'
-            self.nodemetadata[regnodename]['registry'] = origregistry
-            self.nodemetadata[regnodename]['link'] = newregnodename
-            self.digraph.add_node(newregnodename, type='REGISTRY')
+            nextid = next(self._event_counter)
+            newregnodename = 'REGISTRY ' + str(nextid)
+            self.nodemetadata[newregnodename] = \
+                _RegistryLinkMetadata(link=regnodename)
+            self.nodemetadata[regnodename] = \
+                _RegistryMetadata(node_type='REGISTRY', registry=registry,
+                                  link=newregnodename)
+            self._pending_nodes.append((newregnodename,
+                                        {'type': 'REGISTRY'}))
         else:
             newregnodename = self.nodemetadata[regnodename]['link']
 
@@ -901,124 +1273,116 @@ class CuckooJSONReport(object):
         :param url:  URL
         :returns: Node name for the URL.
         """
-        origurl = url
-        urlnodename = '"URL {0}"'.format(url)
+        urlnodename = '"URL ' + url + '"'
         if urlnodename not in self.nodemetadata:
-            self.nodemetadata[urlnodename] = dict()
-            self.nodemetadata[urlnodename]['node_type'] = 'URL'
-            self.nodemetadata[urlnodename]['url'] = origurl
-            self.digraph.add_node(urlnodename, type='URL')
+            self.nodemetadata[urlnodename] = _URLMetadata(node_type='URL',
+                                                          url=url)
+            self._pending_nodes.append((urlnodename, {'type': 'URL'}))
 
         return urlnodename
 
-    def _add_sockets(self, node, calls):
+    def _add_sockets(self, node, api_calls):
         """
         Internal function to add Sockets to the graph.
 
         :param node:  The node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls.
+        :param api_calls:  A dict of API name to process calls.
         :returns: Nothing.
         """
-        sockets = calls[calls['api'] == 'socket']
-
-        for i, sock in sockets.iterrows():
-            socketid = None
-            socketproto = None
-
-            for arg in sock['arguments']:
-                if arg['name'] == 'socket':
-                    socketid = arg['value']
-                if arg['name'] == 'protocol':
-                    if int(arg['value']) in self.IPProto:
-                        socketproto = self.IPProto[int(arg['value'])]
-                    else:
-                        socketproto = arg['value']
+        sockets = api_calls.get('socket', ())
+        if not sockets:
+            return
+
+        # The calls are in time order, so the close and connect times
+        # can be bisected.  The timestamps have a fixed width, so they
+        # compare correctly as strings...
+        closetimes = [c['timestamp'] for c in api_calls.get('closesocket', ())]
+        tcpconnects = api_calls.get('connect', ())
+        connecttimes = [c['timestamp'] for c in tcpconnects]
+
+        for sock in sockets:
+            args = sock['args']
+            socketid = args.get('socket')
+            socketproto = args.get('protocol')
+            try:
+                protonum = int(socketproto)
+                if protonum >= 0:
+                    socketproto =\
+                        self._IPProtoTable[protonum] or socketproto
+            except (TypeError, ValueError, IndexError):
+                pass
 
             if socketid is not None:
                 # Get a sequential number for the event...
                 # Sockets can be reused...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
+
+                opentime = sock['timestamp']
 
                 socketname = 'SOCKET {0}'.format(nextid)
-                self.digraph.add_node(socketname, type='SOCKET')
-                self.nodemetadata[socketname] = dict()
-                self.nodemetadata[socketname]['node_type'] = 'SOCKET'
-                self.nodemetadata[socketname]['socket'] = socketid
-                self.nodemetadata[socketname]['protocol'] = socketproto
-                self.nodemetadata[socketname]['opentime'] =\
-                    sock['timestamp']
-
-                closesockets = calls[(calls['api'] == 'closesocket') &
-                                     (calls['timestamp'] > sock['timestamp'])]
-                try:
-                    closetime = next(closesockets.iterrows())[1]['timestamp']
-                except StopIteration:
+                self._pending_nodes.append((socketname, {'type': 'SOCKET'}))
+                self.nodemetadata[socketname] = _SocketMetadata(
+                    node_type='SOCKET',
+                    socket=socketid,
+                    protocol=socketproto,
+                    opentime=opentime)
+
+                # The first close after the open...
+                idx = bisect_right(closetimes, opentime)
+                if idx < len(closetimes):
+                    closetime = closetimes[idx]
+                else:
                     closetime = None
                 self.nodemetadata[socketname]['closetime'] = closetime
 
-                self.digraph.add_edge(node, socketname)
+                self._pending_edges.append((node, socketname))
+
+                # The connects while the socket was open...
+                start = bisect_left(connecttimes, opentime)
+                if closetime is not None:
+                    end = bisect_right(connecttimes, closetime)
+                else:
+                    end = len(connecttimes)
 
-                self._add_tcp_connects(socketname, calls, socketid,
-                                       sock['timestamp'], closetime)
+                self._add_tcp_connects(socketname, tcpconnects[start:end],
+                                       socketid)
 
-    def _add_tcp_connects(self, node, calls, socketid, opentime, closetime):
+    def _add_tcp_connects(self, node, tcpconnects, socketid):
         """
         Internal function to add TCP connections to the graph.
 
         :param node:  The socket node name for the calls.
-        :param calls:  A pandas.DataFrame of process calls.
+        :param tcpconnects:  The connect calls made while the socket
+            was open.
         :param socketid:  The socket opened for these connections.
-        :param opentime:  The time the socket opened.
-        :param closetime:  The time the socket closed.
         :returns: Nothing.
         """
-        if closetime is not None:
-            tcpconnects = calls[(calls['api'] == 'connect') &
-                                (calls['timestamp'] >= opentime) &
-                                (calls['timestamp'] <= closetime)]
-        else:
-            tcpconnects = calls[(calls['api'] == 'connect') &
-                                (calls['timestamp'] >= opentime)]
-
-        for i, tcpconnect in tcpconnects.iterrows():
-            PlotConnect = False
-            for arg in tcpconnect['arguments']:
-                if (arg['name'] == 'socket' and
-                        arg['value'] == socketid):
-                    PlotConnect = True
-
-            if PlotConnect is True:
-                ipaddr = None
-                socketid = None
-                port = None
-                for arg in tcpconnect['arguments']:
-                    if arg['name'] == 'ip':
-                        ipaddr = arg['value']
-                    if arg['name'] == 'socket':
-                        socketid = arg['value']
-                    if arg['name'] == 'port':
-                        port = arg['value']
+        for tcpconnect in tcpconnects:
+            args = tcpconnect['args']
+
+            if args.get('socket') == socketid:
+                ipaddr = args.get('ip')
+                port = args.get('port')
 
                 if ipaddr is not None:
                     ipnodename = self._add_ip(ipaddr)
 
                     # Get a sequential number for the event...
-                    nextid = len(self.nodemetadata)
+                    nextid = next(self._event_counter)
 
                     connnodename = 'TCP CONNECT {0}'.format(nextid)
-                    self.digraph.add_node(connnodename, type='TCPCONNECT')
-                    self.nodemetadata[connnodename] = dict()
-                    self.nodemetadata[connnodename]['node_type'] =\
-                        "TCPCONNECT"
-                    self.nodemetadata[connnodename]['timestamp'] =\
-                        tcpconnect['timestamp']
-                    self.nodemetadata[connnodename]['ip'] = ipaddr
-                    self.nodemetadata[connnodename]['socket'] = socketid
-                    self.nodemetadata[connnodename]['port'] = port
+                    self._pending_nodes.append((connnodename,
+                                                {'type': 'TCPCONNECT'}))
+                    self.nodemetadata[connnodename] = _TCPConnectMetadata(
+                        node_type="TCPCONNECT",
+                        timestamp=tcpconnect['timestamp'],
+                        ip=ipaddr,
+                        socket=socketid,
+                        port=port)
 
                     # Connect them up...
-                    self.digraph.add_edge(node, connnodename)
-                    self.digraph.add_edge(connnodename, ipnodename)
+                    self._pending_edges.append((node, connnodename))
+                    self._pending_edges.append((connnodename, ipnodename))
 
     def _add_registry_activity(self):
         """
@@ -1027,1308 +1391,1206 @@ class CuckooJSONReport(object):
 
         :returns:  Nothing.
         """
-        metadata = self.nodemetadata.copy()
-        for node in metadata:
-            if metadata[node]['node_type'] == 'PID':
-                if 'calls' in metadata[node]:
-                    calls = metadata[node]['calls']
-
-                    # Get registry writes...
-                    if self.plotregistrywrites is True:
-                        self._add_registry_writes(node, calls)
-
-                    if self.plotregistrydeletes is True:
-                        self._add_registry_deletes(node, calls)
-
-                    if self.plotregistrycreates is True:
-                        self._add_registry_creates(node, calls)
-
-                    if self.plotregistryreads is True:
-                        self._add_registry_reads(node, calls)
+        for node in self._pid_nodes_with_calls():
+            api_calls = self.nodemetadata[node]['api_calls']
+
+            # Get registry writes...
+            if self.plotregistrywrites is True:
+                self._add_registry_writes(
+                    node, self._api_calls(api_calls,
+                                          ('RegSetValueExA',
+                                           'RegSetValueExW',
+                                           'NtSetValueKey')))
+
+            if self.plotregistrydeletes is True:
+                self._add_registry_deletes(
+                    node, self._api_calls(api_calls,
+                                          ('RegDeleteValueA',
+                                           'RegDeleteValueW',
+                                           'NtDeleteKey')))
+
+            if self.plotregistrycreates is True:
+                self._add_registry_creates(
+                    node, self._api_calls(api_calls,
+                                          ('RegCreateKeyExA',
+                                           'RegCreateKeyExW',
+                                           'NtCreateKey')))
+
+            if self.plotregistryreads is True:
+                self._add_registry_reads(
+                    node, self._api_calls(api_calls,
+                                          ('RegQueryValueExA',
+                                           'RegQueryValueExW',
+                                           'NtQueryValueKey')))
+
+        self._flush_pending()
 
     def _add_registry_writes(self, node, calls):
         """
         Internal function that adds registry writes to the graph.
 
         :param node:  The PID node name for the calls.
-        :param calls:  The api calls.
+        :param calls:  The successful registry write calls.
         :returns:  Nothing.
         """
-        regwrites = calls[((calls['api'] == 'RegSetValueExA') |
-                          (calls['api'] == 'RegSetValueExW') |
-                          (calls['api'] == 'NtSetValueKey')) &
-                          (calls['status'] == True)]
-
-        for i, regwrite in regwrites.iterrows():
-            regname = None
-            for arg in regwrite['arguments']:
-                if arg['name'] == 'FullName':
-                    regname = arg['value']
-                if arg['name'] == 'Buffer':
-                    regbuff = arg['value']
+        for regwrite in calls:
+            args = regwrite['args']
+            regname = args.get('FullName')
+            regbuff = args.get('Buffer')
             if regname is not None:
-                if (self._search_re(regname, self.ignorepaths) and
-                        not self._search_re(regname, self.includepaths)):
+                if self._filtered(regname):
                     continue
                 regnodename = self._add_reg(regname)
                 # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
                 rwnodename = "REGISTRY WRITE {0}".format(nextid)
-                self.nodemetadata[rwnodename] = dict()
-                self.nodemetadata[rwnodename]['registry'] = regname
-                self.nodemetadata[rwnodename]['node_type'] = 'REGISTRYWRITE'
-                self.nodemetadata[rwnodename]['timestamp'] =\
-                    regwrite['timestamp']
-                self.nodemetadata[rwnodename]['buffer'] = regbuff
-                self.digraph.add_node(rwnodename, type='REGISTRYWRITE')
+                self.nodemetadata[rwnodename] = _RegistryWriteMetadata(
+                    node_type='REGISTRYWRITE',
+                    registry=regname,
+                    timestamp=regwrite['timestamp'],
+                    buffer=regbuff)
+                self._pending_nodes.append((rwnodename,
+                                            {'type': 'REGISTRYWRITE'}))
 
-                self.digraph.add_edge(node, rwnodename)
-                self.digraph.add_edge(rwnodename, regnodename)
+                self._pending_edges.append((node, rwnodename))
+                self._pending_edges.append((rwnodename, regnodename))
 
     def _add_registry_deletes(self, node, calls):
         """
         Internal function that adds registry deletes to the graph.
 
         :param node:  The PID node name for the calls.
-        :param calls:  The api calls.
+        :param calls:  The successful registry delete calls.
         :returns:  Nothing.
         """
-        regdeletes = calls[((calls['api'] == 'RegDeleteValueA') |
-                           (calls['api'] == 'RegDeleteValueW') |
-                           (calls['api'] == 'NtDeleteKey')) &
-                           (calls['status'] == True)]
-
-        for i, regdelete in regdeletes.iterrows():
-            regname = None
-            for arg in regdelete['arguments']:
-                if arg['name'] == 'FullName':
-                    regname = arg['value']
+        for regdelete in calls:
+            args = regdelete['args']
+            regname = args.get('FullName')
             if regname is not None:
-                if (self._search_re(regname, self.ignorepaths) and
-                        not self._search_re(regname, self.includepaths)):
+                if self._filtered(regname):
                     continue
                 regnodename = self._add_reg(regname)
                 # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
                 rdnodename = "REGISTRY DELETE {0}".format(nextid)
-                self.nodemetadata[rdnodename] = dict()
-                self.nodemetadata[rdnodename]['registry'] = regname
-                self.nodemetadata[rdnodename]['node_type'] = 'REGISTRYDELETE'
-                self.nodemetadata[rdnodename]['timestamp'] =\
-                    regdelete['timestamp']
-                self.digraph.add_node(rdnodename, type='REGISTRYDELETE')
+                self.nodemetadata[rdnodename] = _RegistryEventMetadata(
+                    node_type='REGISTRYDELETE',
+                    registry=regname,
+                    timestamp=regdelete['timestamp'])
+                self._pending_nodes.append((rdnodename,
+                                            {'type': 'REGISTRYDELETE'}))
 
-                self.digraph.add_edge(node, rdnodename)
-                self.digraph.add_edge(rdnodename, regnodename)
+                self._pending_edges.append((node, rdnodename))
+                self._pending_edges.append((rdnodename, regnodename))
 
     def _add_registry_creates(self, node, calls):
         """
         Internal function that adds registry creates to the graph.
 
         :param node:  The PID node name for the calls.
-        :param calls:  The api calls.
+        :param calls:  The successful registry create calls.
         :returns:  Nothing.
         """
-        regcreates = calls[((calls['api'] == 'RegCreateKeyExA') |
-                           (calls['api'] == 'RegCreateKeyExW') |
-                           (calls['api'] == 'NtCreateKey')) &
-                           (calls['status'] == True)]
-
-        for i, regcreate in regcreates.iterrows():
-            regname = None
-            for arg in regcreate['arguments']:
-                if arg['name'] == 'FullName':
-                    regname = arg['value']
+        for regcreate in calls:
+            args = regcreate['args']
+            regname = args.get('FullName')
             if regname is not None:
-                if (self._search_re(regname, self.ignorepaths) and
-                        not self._search_re(regname, self.includepaths)):
+                if self._filtered(regname):
                     continue
                 regnodename = self._add_reg(regname)
                 # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
                 rcnodename = "REGISTRY CREATE {0}".format(nextid)
-                self.nodemetadata[rcnodename] = dict()
-                self.nodemetadata[rcnodename]['registry'] = regname
-                self.nodemetadata[rcnodename]['node_type'] = 'REGISTRYCREATE'
-                self.nodemetadata[rcnodename]['timestamp'] =\
-                    regcreate['timestamp']
-                self.digraph.add_node(rcnodename, type='REGISTRYCREATE')
+                self.nodemetadata[rcnodename] = _RegistryEventMetadata(
+                    node_type='REGISTRYCREATE',
+                    registry=regname,
+                    timestamp=regcreate['timestamp'])
+                self._pending_nodes.append((rcnodename,
+                                            {'type': 'REGISTRYCREATE'}))
 
-                self.digraph.add_edge(node, rcnodename)
-                self.digraph.add_edge(rcnodename, regnodename)
+                self._pending_edges.append((node, rcnodename))
+                self._pending_edges.append((rcnodename, regnodename))
 
     def _add_registry_reads(self, node, calls):
         """
         Internal function that adds registry reads to the graph.
 
         :param node:  The PID node name for the calls.
-        :param calls:  The api calls.
+        :param calls:  The successful registry read calls.
         :returns:  Nothing.
         """
-        regreads = calls[((calls['api'] == 'RegQueryValueExA') |
-                         (calls['api'] == 'RegQueryValueExW') |
-                         (calls['api'] == 'NtQueryValueKey')) &
-                         (calls['status'] == True)]
-
-        for i, regread in regreads.iterrows():
-            regname = None
-            for arg in regread['arguments']:
-                if arg['name'] == 'FullName':
-                    regname = arg['value']
+        for regread in calls:
+            args = regread['args']
+            regname = args.get('FullName')
             if regname is not None:
-                if (self._search_re(regname, self.ignorepaths) and
-                        not self._search_re(regname, self.includepaths)):
+                if self._filtered(regname):
                     continue
                 regnodename = self._add_reg(regname)
                 # Get a sequential number for the event...
-                nextid = len(self.nodemetadata)
+                nextid = next(self._event_counter)
                 rrnodename = "REGISTRY READ {0}".format(nextid)
-                self.nodemetadata[rrnodename] = dict()
-                self.nodemetadata[rrnodename]['registry'] = regname
-                self.nodemetadata[rrnodename]['node_type'] = 'REGISTRYREAD'
-                self.nodemetadata[rrnodename]['timestamp'] =\
-                    regread['timestamp']
-                self.digraph.add_node(rrnodename, type='REGISTRYREAD')
+                self.nodemetadata[rrnodename] = _RegistryEventMetadata(
+                    node_type='REGISTRYREAD',
+                    registry=regname,
+                    timestamp=regread['timestamp'])
+                self._pending_nodes.append((rrnodename,
+                                            {'type': 'REGISTRYREAD'}))
 
-                self.digraph.add_edge(node, rrnodename)
-                self.digraph.add_edge(rrnodename, regnodename)
+                self._pending_edges.append((node, rrnodename))
+                self._pending_edges.append((rrnodename, regnodename))
 
-    def _create_positions_digraph(self):
+    def _graphkey(self):
         """
-        Internal function to create the positions of the graph.
+        Internal function to hash the structure of the graph, which
+        is what the layout positions depend on.
 
-        :returns: Nothing.
+        :returns: A hex digest of the nodes, edges, and root PID.
         """
-
-        # Create the positions...
-        if self.graphvizprog is None:
-            #  self.pos = networkx.fruchterman_reingold_layout(self.digraph)
-            self.pos = networkx.spring_layout(self.digraph)
-            # self.pos = networkx.circular_layout(self.digraph)
-            # self.pos = networkx.shell_layout(self.digraph)
-            # self.pos = networkx.spectral_layout(self.digraph)
+        # BLAKE2 is not available before Python 3.6...
+        if hasattr(hashlib, 'blake2b'):
+            graphhash = hashlib.blake2b(digest_size=20)
         else:
-            self.pos = \
-                networkx.drawing.nx_pydot.graphviz_layout(
-                    self.digraph, prog=self.graphvizprog,
-                    root=self.rootpid)
-
-    def _generategraph(self):
-        """
-        Internal function to create the output data for plotly.
-
-        :returns: The data that can be plotted with plotly scatter
-            plots.
-        """
-
-        # Node coordinates...
-        ProcessX = []
-        ProcessY = []
-        HostX = []
-        HostY = []
-        IPX = []
-        IPY = []
-        SocketX = []
-        SocketY = []
-        TCPConnectX = []
-        TCPConnectY = []
-        FileX = []
-        FileY = []
-        FileCreateX = []
-        FileCreateY = []
-        FileWriteX = []
-        FileWriteY = []
-        FileCopyX = []
-        FileCopyY = []
-        FileDeleteX = []
-        FileDeleteY = []
-        FileMoveX = []
-        FileMoveY = []
-        FileReadX = []
-        FileReadY = []
-        RegistryX = []
-        RegistryY = []
-        RegistryWriteX = []
-        RegistryWriteY = []
-        RegistryDeleteX = []
-        RegistryDeleteY = []
-        RegistryCreateX = []
-        RegistryCreateY = []
-        RegistryReadX = []
-        RegistryReadY = []
-        URLX = []
-        URLY = []
-        ServerX = []
-        ServerY = []
-        IPConnX = []
-        IPConnY = []
+            graphhash = hashlib.sha1()
 
-        # Edge coordinates...
-        ProcessXe = []
-        ProcessYe = []
-        GetNameXe = []
-        GetNameYe = []
-        DNSXe = []
-        DNSYe = []
-        SocketXe = []
-        SocketYe = []
-        TCPConnectXe = []
-        TCPConnectYe = []
-        FileCreateXe = []
-        FileCreateYe = []
-        LoadImageXe = []
-        LoadImageYe = []
-        FileWriteXe = []
-        FileWriteYe = []
-        FileCopyXe = []
-        FileCopyYe = []
-        FileDeleteXe = []
-        FileDeleteYe = []
-        FileMoveXe = []
-        FileMoveYe = []
-        FileReadXe = []
-        FileReadYe = []
-        RegistryWriteXe = []
-        RegistryWriteYe = []
-        RegistryDeleteXe = []
-        RegistryDeleteYe = []
-        RegistryCreateXe = []
-        RegistryCreateYe = []
-        RegistryReadXe = []
-        RegistryReadYe = []
-        URLXe = []
-        URLYe = []
-        ServerXe = []
-        ServerYe = []
-        IPConnXe = []
-        IPConnYe = []
-
-        # Hover Text...
-        proctxt = []
-        hosttxt = []
-        iptxt = []
-        sockettxt = []
-        tcpconnecttxt = []
-        filetxt = []
-        filecreatetxt = []
-        filewritetxt = []
-        filecopytxt = []
-        filedeletetxt = []
-        filemovetxt = []
-        filereadtxt = []
-        registrytxt = []
-        registrywritetxt = []
-        registrydeletetxt = []
-        registrycreatetxt = []
-        registryreadtxt = []
-        urltxt = []
-        servertxt = []
-        ipconntxt = []
-
-        # Traverse nodes...
-        for node in self.digraph:
-            if self.digraph.node[node]['type'] == 'PID':
-                ProcessX.append(self.pos[node][0])
-                ProcessY.append(self.pos[node][1])
-                if 'cmdline' in self.nodemetadata[node]:
-                    cmdline = self.nodemetadata[node]['cmdline']
-                else:
-                    cmdline = "Not Available"
-                proctxt.append(
-                    "PID: {0}<br>"
-                    "Path: {1}<br>"
-                    "Command Line: {2}<br>"
-                    "Parent PID: {3}<br>"
-                    "First Seen: {4}"
-                    .format(
-                        self.nodemetadata[node]['pid'],
-                        self.nodemetadata[node]['module_path'],
-                        cmdline,
-                        self.nodemetadata[node]['parent_id'],
-                        self.nodemetadata[node]['first_seen']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'HOST':
-                HostX.append(self.pos[node][0])
-                HostY.append(self.pos[node][1])
-                hosttxt.append(
-                    "HOST: {0}"
-                    .format(
-                        self.nodemetadata[node]['host']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'SERVERCONNECT':
-                ServerX.append(self.pos[node][0])
-                ServerY.append(self.pos[node][1])
-                servertxt.append(
-                    "Server Connect: {0}<br>"
-                    "Port: {1}<br>"
-                    "Time: {2}"
-                    .format(
-                        self.nodemetadata[node]['server'],
-                        self.nodemetadata[node]['port'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'IPCONNECT':
-                IPConnX.append(self.pos[node][0])
-                IPConnY.append(self.pos[node][1])
-                ipconntxt.append(
-                    "IP Connect: {0}<br>"
-                    "Port: {1}<br>"
-                    "Time: {2}"
-                    .format(
-                        self.nodemetadata[node]['ip'],
-                        self.nodemetadata[node]['port'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'IP':
-                IPX.append(self.pos[node][0])
-                IPY.append(self.pos[node][1])
-                iptxt.append(
-                    "IP: {0}"
-                    .format(
-                        self.nodemetadata[node]['ip']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'SOCKET':
-                SocketX.append(self.pos[node][0])
-                SocketY.append(self.pos[node][1])
-                sockettxt.append(
-                    "Socket: {0}<br>"
-                    "Protocol: {1}<br>"
-                    "Open Time: {2}<br>"
-                    "Close TIme: {3}"
-                    .format(
-                        self.nodemetadata[node]['socket'],
-                        self.nodemetadata[node]['protocol'],
-                        self.nodemetadata[node]['opentime'],
-                        self.nodemetadata[node]['closetime']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'TCPCONNECT':
-                TCPConnectX.append(self.pos[node][0])
-                TCPConnectY.append(self.pos[node][1])
-                tcpconnecttxt.append(
-                    "TCP Connect:<br>"
-                    "IP: {0}<br>"
-                    "Port: {1}<br>"
-                    "Socket: {2}<br>"
-                    "Time: {3}"
-                    .format(
-                        self.nodemetadata[node]['ip'],
-                        self.nodemetadata[node]['port'],
-                        self.nodemetadata[node]['socket'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILE':
-                FileX.append(self.pos[node][0])
-                FileY.append(self.pos[node][1])
-                filetxt.append(
-                    "File: {0}"
-                    .format(
-                        self.nodemetadata[node]['file']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILECREATE':
-                FileCreateX.append(self.pos[node][0])
-                FileCreateY.append(self.pos[node][1])
-                filecreatetxt.append(
-                    "File Create: {0}<br>"
-                    "Existed Before: {1}<br>"
-                    "Desired Access: {2}<br>"
-                    "Create Disposition: {3}<br>"
-                    "File Atributes: {4}<br>"
-                    "Time: {5}"
-                    .format(
-                        self.nodemetadata[node]['file'],
-                        self.nodemetadata[node]['existedbefore'],
-                        self.nodemetadata[node]['desiredaccess'],
-                        self.nodemetadata[node]['createdisposition'],
-                        self.nodemetadata[node]['fileattribtes'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILEWRITE':
-                FileWriteX.append(self.pos[node][0])
-                FileWriteY.append(self.pos[node][1])
-                filewritetxt.append(
-                    "File Write: {0}<br>"
-                    "Time: {1}"
-                    .format(
-                        self.nodemetadata[node]['file'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILECOPY':
-                FileCopyX.append(self.pos[node][0])
-                FileCopyY.append(self.pos[node][1])
-                filecopytxt.append(
-                    "File Copy:<br>"
-                    "Existing File: {0}<br>"
-                    "New File: {1}<br>"
-                    "Existed Before: {2}<br>"
-                    "Time: {3}"
-                    .format(
-                        self.nodemetadata[node]['existingfile'],
-                        self.nodemetadata[node]['newfile'],
-                        self.nodemetadata[node]['existedbefore'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILEDELETE':
-                FileDeleteX.append(self.pos[node][0])
-                FileDeleteY.append(self.pos[node][1])
-                filedeletetxt.append(
-                    "File Delete: {0}<br>"
-                    "Time: {1}"
-                    .format(
-                        self.nodemetadata[node]['file'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILEMOVE':
-                FileMoveX.append(self.pos[node][0])
-                FileMoveY.append(self.pos[node][1])
-                filemovetxt.append(
-                    "File Move:<br>"
-                    "Existing File: {0}<br>"
-                    "New File: {1}<br>"
-                    "Time: {2}"
-                    .format(
-                        self.nodemetadata[node]['existingfile'],
-                        self.nodemetadata[node]['newfile'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'FILEREAD':
-                FileReadX.append(self.pos[node][0])
-                FileReadY.append(self.pos[node][1])
-                filereadtxt.append(
-                    "File Read: {0}<br>"
-                    "Time: {1}"
-                    .format(
-                        self.nodemetadata[node]['file'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'REGISTRY':
-                RegistryX.append(self.pos[node][0])
-                RegistryY.append(self.pos[node][1])
-                newreg = self.nodemetadata[node]['link']
-                registrytxt.append(
-                    "Registry: {0}"
-                    .format(
-                        self.nodemetadata[newreg]['registry']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'REGISTRYWRITE':
-                RegistryWriteX.append(self.pos[node][0])
-                RegistryWriteY.append(self.pos[node][1])
-                registrywritetxt.append(
-                    "Registry Write: {0}<br>"
-                    "Buffer: {1}<br>"
-                    "Time: {2}"
-                    .format(
-                        self.nodemetadata[node]['registry'],
-                        self.nodemetadata[node]['buffer'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'REGISTRYDELETE':
-                RegistryDeleteX.append(self.pos[node][0])
-                RegistryDeleteY.append(self.pos[node][1])
-                registrydeletetxt.append(
-                    "Registry Delete: {0}<br>"
-                    "Time: {1}"
-                    .format(
-                        self.nodemetadata[node]['registry'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'REGISTRYCREATE':
-                RegistryCreateX.append(self.pos[node][0])
-                RegistryCreateY.append(self.pos[node][1])
-                registrycreatetxt.append(
-                    "Registry Create: {0}<br>"
-                    "Time: {1}"
-                    .format(
-                        self.nodemetadata[node]['registry'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'REGISTRYREAD':
-                RegistryReadX.append(self.pos[node][0])
-                RegistryReadY.append(self.pos[node][1])
-                registryreadtxt.append(
-                    "Registry Read: {0}<br>"
-                    "Time: {1}"
-                    .format(
-                        self.nodemetadata[node]['registry'],
-                        self.nodemetadata[node]['timestamp']
-                        )
-                               )
-            if self.digraph.node[node]['type'] == 'URL':
-                URLX.append(self.pos[node][0])
-                URLY.append(self.pos[node][1])
-                urltxt.append(
-                    "URL: {0}"
-                    .format(
-                        self.nodemetadata[node]['url']
-                        )
-                               )
-
-        # Traverse edges...
-        for edge in self.digraph.edges():
-            if (self.digraph.node[edge[0]]['type'] == 'PID' and
-                    self.digraph.node[edge[1]]['type'] == 'PID'):
-                ProcessXe.append(self.pos[edge[0]][0])
-                ProcessXe.append(self.pos[edge[1]][0])
-                ProcessXe.append(None)
-                ProcessYe.append(self.pos[edge[0]][1])
-                ProcessYe.append(self.pos[edge[1]][1])
-                ProcessYe.append(None)
-            if (self.digraph.node[edge[0]]['type'] == 'PID' and
-                    self.digraph.node[edge[1]]['type'] == 'HOST'):
-                GetNameXe.append(self.pos[edge[0]][0])
-                GetNameXe.append(self.pos[edge[1]][0])
-                GetNameXe.append(None)
-                GetNameYe.append(self.pos[edge[0]][1])
-                GetNameYe.append(self.pos[edge[1]][1])
-                GetNameYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'SERVERCONNECT') or
-                (self.digraph.node[edge[0]]['type'] == 'SERVERCONNECT' and
-                    self.digraph.node[edge[1]]['type'] == 'HOST')):
-                ServerXe.append(self.pos[edge[0]][0])
-                ServerXe.append(self.pos[edge[1]][0])
-                ServerXe.append(None)
-                ServerYe.append(self.pos[edge[0]][1])
-                ServerYe.append(self.pos[edge[1]][1])
-                ServerYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'IPCONNECT') or
-                (self.digraph.node[edge[0]]['type'] == 'IPCONNECT' and
-                    self.digraph.node[edge[1]]['type'] == 'IP')):
-                IPConnXe.append(self.pos[edge[0]][0])
-                IPConnXe.append(self.pos[edge[1]][0])
-                IPConnXe.append(None)
-                IPConnYe.append(self.pos[edge[0]][1])
-                IPConnYe.append(self.pos[edge[1]][1])
-                IPConnYe.append(None)
-            if (self.digraph.node[edge[0]]['type'] == 'HOST' and
-                    self.digraph.node[edge[1]]['type'] == 'IP'):
-                DNSXe.append(self.pos[edge[0]][0])
-                DNSXe.append(self.pos[edge[1]][0])
-                DNSXe.append(None)
-                DNSYe.append(self.pos[edge[0]][1])
-                DNSYe.append(self.pos[edge[1]][1])
-                DNSYe.append(None)
-            if (self.digraph.node[edge[0]]['type'] == 'PID' and
-                    self.digraph.node[edge[1]]['type'] == 'SOCKET'):
-                SocketXe.append(self.pos[edge[0]][0])
-                SocketXe.append(self.pos[edge[1]][0])
-                SocketXe.append(None)
-                SocketYe.append(self.pos[edge[0]][1])
-                SocketYe.append(self.pos[edge[1]][1])
-                SocketYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'SOCKET' and
-                self.digraph.node[edge[1]]['type'] == 'TCPCONNECT') or
-                (self.digraph.node[edge[0]]['type'] == 'TCPCONNECT' and
-                    self.digraph.node[edge[1]]['type'] == 'IP')):
-                TCPConnectXe.append(self.pos[edge[0]][0])
-                TCPConnectXe.append(self.pos[edge[1]][0])
-                TCPConnectXe.append(None)
-                TCPConnectYe.append(self.pos[edge[0]][1])
-                TCPConnectYe.append(self.pos[edge[1]][1])
-                TCPConnectYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'FILECREATE') or
-                (self.digraph.node[edge[0]]['type'] == 'FILECREATE' and
-                    self.digraph.node[edge[1]]['type'] == 'FILE')):
-                FileCreateXe.append(self.pos[edge[0]][0])
-                FileCreateXe.append(self.pos[edge[1]][0])
-                FileCreateXe.append(None)
-                FileCreateYe.append(self.pos[edge[0]][1])
-                FileCreateYe.append(self.pos[edge[1]][1])
-                FileCreateYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'FILEWRITE') or
-                (self.digraph.node[edge[0]]['type'] == 'FILEWRITE' and
-                    self.digraph.node[edge[1]]['type'] == 'FILE')):
-                FileWriteXe.append(self.pos[edge[0]][0])
-                FileWriteXe.append(self.pos[edge[1]][0])
-                FileWriteXe.append(None)
-                FileWriteYe.append(self.pos[edge[0]][1])
-                FileWriteYe.append(self.pos[edge[1]][1])
-                FileWriteYe.append(None)
-            if (self.digraph.node[edge[0]]['type'] == 'FILE' and
-                    self.digraph.node[edge[1]]['type'] == 'PID'):
-                LoadImageXe.append(self.pos[edge[0]][0])
-                LoadImageXe.append(self.pos[edge[1]][0])
-                LoadImageXe.append(None)
-                LoadImageYe.append(self.pos[edge[0]][1])
-                LoadImageYe.append(self.pos[edge[1]][1])
-                LoadImageYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'FILECOPY') or
-                (self.digraph.node[edge[0]]['type'] == 'FILECOPY' and
-                    self.digraph.node[edge[1]]['type'] == 'FILE')):
-                FileCopyXe.append(self.pos[edge[0]][0])
-                FileCopyXe.append(self.pos[edge[1]][0])
-                FileCopyXe.append(None)
-                FileCopyYe.append(self.pos[edge[0]][1])
-                FileCopyYe.append(self.pos[edge[1]][1])
-                FileCopyYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'FILEDELETE') or
-                (self.digraph.node[edge[0]]['type'] == 'FILEDELETE' and
-                    self.digraph.node[edge[1]]['type'] == 'FILE')):
-                FileDeleteXe.append(self.pos[edge[0]][0])
-                FileDeleteXe.append(self.pos[edge[1]][0])
-                FileDeleteXe.append(None)
-                FileDeleteYe.append(self.pos[edge[0]][1])
-                FileDeleteYe.append(self.pos[edge[1]][1])
-                FileDeleteYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'FILEMOVE') or
-                (self.digraph.node[edge[0]]['type'] == 'FILEMOVE' and
-                    self.digraph.node[edge[1]]['type'] == 'FILE')):
-                FileMoveXe.append(self.pos[edge[0]][0])
-                FileMoveXe.append(self.pos[edge[1]][0])
-                FileMoveXe.append(None)
-                FileMoveYe.append(self.pos[edge[0]][1])
-                FileMoveYe.append(self.pos[edge[1]][1])
-                FileMoveYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'FILEREAD') or
-                (self.digraph.node[edge[0]]['type'] == 'FILEREAD' and
-                    self.digraph.node[edge[1]]['type'] == 'FILE')):
-                FileReadXe.append(self.pos[edge[0]][0])
-                FileReadXe.append(self.pos[edge[1]][0])
-                FileReadXe.append(None)
-                FileReadYe.append(self.pos[edge[0]][1])
-                FileReadYe.append(self.pos[edge[1]][1])
-                FileReadYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'REGISTRYWRITE') or
-                (self.digraph.node[edge[0]]['type'] == 'REGISTRYWRITE' and
-                    self.digraph.node[edge[1]]['type'] == 'REGISTRY')):
-                RegistryWriteXe.append(self.pos[edge[0]][0])
-                RegistryWriteXe.append(self.pos[edge[1]][0])
-                RegistryWriteXe.append(None)
-                RegistryWriteYe.append(self.pos[edge[0]][1])
-                RegistryWriteYe.append(self.pos[edge[1]][1])
-                RegistryWriteYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'REGISTRYDELETE') or
-                (self.digraph.node[edge[0]]['type'] == 'REGISTRYDELETE' and
-                    self.digraph.node[edge[1]]['type'] == 'REGISTRY')):
-                RegistryDeleteXe.append(self.pos[edge[0]][0])
-                RegistryDeleteXe.append(self.pos[edge[1]][0])
-                RegistryDeleteXe.append(None)
-                RegistryDeleteYe.append(self.pos[edge[0]][1])
-                RegistryDeleteYe.append(self.pos[edge[1]][1])
-                RegistryDeleteYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'REGISTRYCREATE') or
-                (self.digraph.node[edge[0]]['type'] == 'REGISTRYCREATE' and
-                    self.digraph.node[edge[1]]['type'] == 'REGISTRY')):
-                RegistryCreateXe.append(self.pos[edge[0]][0])
-                RegistryCreateXe.append(self.pos[edge[1]][0])
-                RegistryCreateXe.append(None)
-                RegistryCreateYe.append(self.pos[edge[0]][1])
-                RegistryCreateYe.append(self.pos[edge[1]][1])
-                RegistryCreateYe.append(None)
-            if ((self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'REGISTRYREAD') or
-                (self.digraph.node[edge[0]]['type'] == 'REGISTRYREAD' and
-                    self.digraph.node[edge[1]]['type'] == 'REGISTRY')):
-                RegistryReadXe.append(self.pos[edge[0]][0])
-                RegistryReadXe.append(self.pos[edge[1]][0])
-                RegistryReadXe.append(None)
-                RegistryReadYe.append(self.pos[edge[0]][1])
-                RegistryReadYe.append(self.pos[edge[1]][1])
-                RegistryReadYe.append(None)
-            if (self.digraph.node[edge[0]]['type'] == 'PID' and
-                self.digraph.node[edge[1]]['type'] == 'URL'):
-                URLXe.append(self.pos[edge[0]][0])
-                URLXe.append(self.pos[edge[1]][0])
-                URLXe.append(None)
-                URLYe.append(self.pos[edge[0]][1])
-                URLYe.append(self.pos[edge[1]][1])
-                URLYe.append(None)
+        graphhash.update(repr((sorted(self.digraph),
+                               sorted(self.digraph.edges()),
+                               self.rootpid)).encode('utf-8'))
 
-        nodes = []
-        edges = []
+        return graphhash.hexdigest()
 
-        # PROCESSES...
+    def _layoutname(self):
+        """
+        Internal function to name the layout the graph gets, which is
+        the graphviz program, or the networkx algorithms used for its
+        components.
 
-        marker = Marker(symbol='circle', size=10)
+        :returns: The layout name, e.g. 'sfdp' or 'forceatlas2+spring'.
+        """
+        if self.graphvizprog is not None:
+            return self.graphvizprog
 
-        # Create the nodes...
-        ProcNodes = Scatter(x=ProcessX,
-                            y=ProcessY,
-                            mode='markers',
-                            marker=marker,
-                            name='Process',
-                            text=proctxt,
-                            hoverinfo='text')
+        return '+'.join(sorted(set(
+            self._layoutalgorithm(component) for component in
+            networkx.weakly_connected_components(self.digraph))))
 
-        # Create the edges for the nodes...
-        ProcEdges = Scatter(x=ProcessXe,
-                            y=ProcessYe,
-                            mode='lines',
-                            line=Line(shape='linear',
-                                      color='rgb(214,39,20)'),
-                            name='Process Start',
-                            hoverinfo='none')
+    def _position_cache_file(self):
+        """
+        Internal function to get the cache file for the positions of
+        the graph with the current layout.
 
-        nodes.append(ProcNodes)
-        edges.append(ProcEdges)
+        :returns: The path of the cache file.
+        """
+        return os.path.join(self.positioncachedir,
+                            "pos_{0}_{1}.npy".format(self._graphkey(),
+                                                     self._layoutname()))
 
-        # HOSTS...
+    def _read_position_cache(self, cachefile):
+        """
+        Internal function to read cached positions.  The cache holds
+        a plain array with the position of each node, in the sorted
+        order of the nodes that the cache file name is a hash of.
 
-        marker = Marker(symbol='square', size=10)
+        :param cachefile: The path of the cache file.
+        :returns: A dict of node to position, or None if the positions
+            are not cached or the cache file is not usable.
+        """
+        try:
+            positions = numpy.load(cachefile, allow_pickle=False)
+        except (IOError, OSError, EOFError, ValueError):
+            return None
 
-        # Create the nodes...
-        HostNodes = Scatter(x=HostX,
-                            y=HostY,
-                            mode='markers',
-                            marker=marker,
-                            name='Host',
-                            text=hosttxt,
-                            hoverinfo='text')
+        nodes = sorted(self.digraph)
+        if (positions.dtype != numpy.float64 or
+                positions.shape != (len(nodes), 2)):
+            return None
 
-        nodes.append(HostNodes)
+        return dict(zip(nodes, map(tuple, positions.tolist())))
 
-        # Create the edges for the nodes...
-        GetNameEdges = Scatter(x=GetNameXe,
-                               y=GetNameYe,
-                               mode='lines',
-                               line=Line(shape='linear',
-                                         color='rgb(174,199,232)'),
-                               name='DNS Query',
-                               hoverinfo='none')
+    def _write_position_cache(self, cachefile):
+        """
+        Internal function to cache the positions.  The positions are
+        written to a temporary file that is then moved into place, so
+        a reader never sees a partly written file.  The oldest cache
+        files beyond positioncachesize are removed.  Errors are
+        ignored, as the cache is only a speed up.
 
-        edges.append(GetNameEdges)
+        :param cachefile: The path of the cache file.
+        :returns: Nothing.
+        """
+        positions = numpy.array([self.pos[n] for n in sorted(self.digraph)],
+                                dtype=numpy.float64).reshape(-1, 2)
+
+        try:
+            if not os.path.isdir(self.positioncachedir):
+                os.makedirs(self.positioncachedir)
+
+            fd, tempname = tempfile.mkstemp(suffix='.tmp',
+                                            dir=self.positioncachedir)
+            try:
+                with os.fdopen(fd, 'wb') as positionfile:
+                    numpy.save(positionfile, positions, allow_pickle=False)
+                # os.replace is not available before Python 3.3...
+                getattr(os, 'replace', os.rename)(tempname, cachefile)
+            except Exception:
+                os.remove(tempname)
+                raise
+
+            # Keep the cache from growing without bound...
+            cachefiles = sorted(
+                glob.glob(os.path.join(self.positioncachedir,
+                                       "pos_*.npy")),
+                key=os.path.getmtime, reverse=True)
+            for oldfile in cachefiles[self.positioncachesize:]:
+                os.remove(oldfile)
+        except (IOError, OSError, ValueError):
+            pass
+
+    def invalidate_position_cache(self):
+        """
+        Function to remove the cached layout positions of this graph,
+        for every layout program, so the next plot lays it out again.
 
-        # SERVERS...
+        :returns: Nothing.
+        """
+        for cachefile in glob.glob(
+                os.path.join(self.positioncachedir,
+                             "pos_{0}_*.npy".format(self._graphkey()))):
+            try:
+                os.remove(cachefile)
+            except OSError:
+                pass
 
-        marker = Marker(symbol='diamond', size=7)
+    def _layoutalgorithm(self, graph):
+        """
+        Internal function to choose the networkx layout algorithm
+        for a graph.  Unless one is chosen, graphs with 500 or more
+        nodes use ForceAtlas2 when the fa2 package is installed, as
+        its Barnes-Hut layout is far faster than spring layout.
 
-        # Create the nodes...
-        ServerNodes = Scatter(x=ServerX,
-                              y=ServerY,
-                              mode='markers',
-                              marker=marker,
-                              name='Server Connections',
-                              text=servertxt,
-                              hoverinfo='text')
+        :param graph: The graph, or set of nodes, to lay out.
+        :returns: 'forceatlas2' or 'spring'.
+        """
+        layoutalgo = self.layoutalgo
+        if layoutalgo is None:
+            if ForceAtlas2 is not None and len(graph) >= 500:
+                layoutalgo = 'forceatlas2'
+            else:
+                layoutalgo = 'spring'
+
+        # ForceAtlas2 needs fa2 or a newer version of networkx...
+        if (layoutalgo == 'forceatlas2' and ForceAtlas2 is None and
+                not hasattr(networkx, 'forceatlas2_layout')):
+            layoutalgo = 'spring'
+
+        return layoutalgo
+
+    def _networkx_layout(self, graph):
+        """
+        Internal function to lay out a graph with networkx, or fa2
+        for ForceAtlas2 when it is installed.
+
+        :param graph: The graph to lay out.
+        :returns: A dict of node to position.
+        """
+        return _layout_component(graph, self._layoutalgorithm(graph))
+
+    def _layout_components(self, graph):
+        """
+        Internal function to lay out each weakly connected component
+        of a graph on its own, then tile them left to right.  Laying
+        out the components together wastes iterations pushing them
+        apart.  The components are laid out in a process pool when
+        there is more than one core and at least 500 nodes outside of
+        the largest component, since otherwise the largest component
+        takes all of the time anyway.
+
+        :param graph: The graph to lay out.
+        :returns: A dict of node to position.
+        """
+        components = sorted(networkx.weakly_connected_components(graph),
+                            key=len, reverse=True)
+        if len(components) < 2:
+            return self._networkx_layout(graph)
+
+        subgraphs = [graph.subgraph(c) for c in components]
+        layoutalgos = [self._layoutalgorithm(g) for g in subgraphs]
+
+        # Lay out the components in parallel if it is worth it...
+        componentpositions = None
+        if (ProcessPoolExecutor is not None and
+                len(graph) - len(components[0]) >= 500):
+            try:
+                if multiprocessing.cpu_count() > 1:
+                    with ProcessPoolExecutor() as executor:
+                        componentpositions = list(executor.map(
+                            _layout_component,
+                            [g.copy() for g in subgraphs],
+                            layoutalgos))
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # No working process pool on this system, so do it here...
+                componentpositions = None
+
+        if componentpositions is None:
+            componentpositions = [_layout_component(g, layoutalgo)
+                                  for g, layoutalgo in
+                                  zip(subgraphs, layoutalgos)]
+
+        pos = dict()
+        spacing = 1.0 / numpy.sqrt(len(graph))
+        left = 0.0
+        for componentpos in componentpositions:
+            xmin = min(p[0] for p in componentpos.values())
+            xmax = max(p[0] for p in componentpos.values())
+            for node, p in componentpos.items():
+                pos[node] = (p[0] - xmin + left, p[1])
+            left += xmax - xmin + spacing
+
+        return pos
+
+    def _create_positions_digraph(self, cachepositions=True):
+        """
+        Internal function to create the positions of the graph.
 
-        nodes.append(ServerNodes)
+        :param cachepositions: Set to False to neither read nor write
+            the position cache.
+        :returns: Nothing.
+        """
+        self.pos = None
 
-        # Create the edges for the nodes...
-        ServerEdges = Scatter(x=ServerXe,
-                              y=ServerYe,
-                              mode='lines',
-                              line=Line(shape='linear'),
-                              name='Server Connect',
-                              hoverinfo='none')
+        # Reuse the positions from an earlier layout of this graph...
+        if cachepositions is True:
+            cachefile = self._position_cache_file()
+            self.pos = self._read_position_cache(cachefile)
 
-        edges.append(ServerEdges)
+        # Create the positions...
+        if self.pos is None:
+            if self.graphvizprog is None:
+                self.pos = self._layout_components(self.digraph)
+            else:
+                # Only needed for graphviz layouts...
+                from networkx.drawing.nx_pydot import graphviz_layout
 
-        # IP CONNECTS...
+                self.pos = graphviz_layout(self.digraph,
+                                           prog=self.graphvizprog,
+                                           root=self.rootpid)
 
-        marker = Marker(symbol='diamond', size=7)
+            if cachepositions is True:
+                self._write_position_cache(cachefile)
 
-        # Create the nodes...
-        IPConnNodes = Scatter(x=IPConnX,
-                              y=IPConnY,
-                              mode='markers',
-                              marker=marker,
-                              name='IP Connections',
-                              text=ipconntxt,
-                              hoverinfo='text')
+        # Index the positions by node, one row per node...
+        self._nodeindex = dict((n, i) for i, n in enumerate(self.digraph))
+        self._positions = numpy.fromiter(
+            (v for n in self.digraph for v in self.pos[n]),
+            dtype=numpy.float64,
+            count=2 * len(self.digraph)).reshape(-1, 2)
 
-        nodes.append(IPConnNodes)
+    def _marker(self, symbol, size, color=None):
+        """
+        Internal function to get a plotly marker, building it only the
+        first time it is asked for.
 
-        # Create the edges for the nodes...
-        IPConnEdges = Scatter(x=IPConnXe,
-                              y=IPConnYe,
-                              mode='lines',
-                              line=Line(shape='linear'),
-                              name='IP Connect',
-                              hoverinfo='none')
+        :param symbol: The marker symbol.
+        :param size: The marker size.
+        :param color: The marker color, or None for the default.
+        :returns: A plotly Marker.
+        """
+        from plotly.graph_objs import Marker
 
-        edges.append(IPConnEdges)
+        key = (symbol, size, color)
+        marker = self._markers.get(key)
+        if marker is None:
+            if color is None:
+                marker = Marker(symbol=symbol, size=size)
+            else:
+                marker = Marker(symbol=symbol, size=size, color=color)
+            self._markers[key] = marker
 
-        # IPS...
+        return marker
 
-        marker = Marker(symbol='square', size=10)
+    def _line(self, color=None, dash=None):
+        """
+        Internal function to get a plotly linear line, building it only
+        the first time it is asked for.
 
-        # Create the nodes...
-        IPNodes = Scatter(x=IPX,
-                          y=IPY,
-                          mode='markers',
-                          marker=marker,
-                          name='IP',
-                          text=iptxt,
-                          hoverinfo='text')
+        :param color: The line color, or None for the default.
+        :param dash: The line dash style, or None for a solid line.
+        :returns: A plotly Line.
+        """
+        from plotly.graph_objs import Line
 
-        nodes.append(IPNodes)
+        key = (color, dash)
+        line = self._lines.get(key)
+        if line is None:
+            kwargs = {'shape': 'linear'}
+            if color is not None:
+                kwargs['color'] = color
+            if dash is not None:
+                kwargs['dash'] = dash
+            line = Line(**kwargs)
+            self._lines[key] = line
 
-        # Create the edges for the nodes...
-        DNSEdges = Scatter(x=DNSXe,
-                           y=DNSYe,
-                           mode='lines',
-                           line=Line(shape='linear',
-                                     color='rgb(23,190,207)'),
-                           name='DNS Response',
-                           hoverinfo='none')
+        return line
 
-        edges.append(DNSEdges)
+    def _nodecoordinates(self, nodes):
+        """
+        Internal function to get the coordinates of nodes.
 
-        # SOCKETS...
+        :param nodes: A list of node names.
+        :returns: A tuple of arrays of the X and Y coordinates for
+            the nodes.
+        """
+        nodeindex = self._nodeindex
+        rows = numpy.fromiter((nodeindex[n] for n in nodes),
+                              dtype=numpy.intp, count=len(nodes))
+        coordinates = self._positions[rows]
 
-        marker = Marker(symbol='diamond', size=7, color='rgb(277,119,194)')
+        return coordinates[:, 0], coordinates[:, 1]
 
-        # Create the nodes...
-        SocketNodes = Scatter(x=SocketX,
-                              y=SocketY,
-                              mode='markers',
-                              marker=marker,
-                              name='Socket',
-                              text=sockettxt,
-                              hoverinfo='text')
+    def _edgecoordinates(self, edgeends, edgecategory, category):
+        """
+        Internal function to get the coordinates of the edges in one
+        category, with a NaN between edges so plotly draws them as
+        separate lines (plotly writes the NaN out as null).
 
-        # Create the edges for the nodes...
-        SocketEdges = Scatter(x=SocketXe,
-                              y=SocketYe,
-                              mode='lines',
-                              line=Line(shape='linear',
-                                        color='rgb(227,119,194)'),
-                              name='Create Socket',
-                              hoverinfo='none')
+        :param edgeends: An array of the positions array rows for the
+            source and target of each edge.
+        :param edgecategory: An array of the category of each edge.
+        :param category: The category of the edges to get.
+        :returns: A tuple of arrays of the X and Y coordinates for
+            the edges.
+        """
+        ends = edgeends[edgecategory == category]
+        sources = ends[:, 0]
+        targets = ends[:, 1]
 
-        nodes.append(SocketNodes)
-        edges.append(SocketEdges)
+        coordinates = []
+        for axis in (0, 1):
+            axiscoordinates = numpy.empty((len(sources), 3),
+                                          dtype=numpy.float64)
+            axiscoordinates[:, 0] = self._positions[sources, axis]
+            axiscoordinates[:, 1] = self._positions[targets, axis]
+            axiscoordinates[:, 2] = numpy.nan
+            coordinates.append(axiscoordinates.ravel())
 
-        # TCP CONNECTS...
+        return coordinates[0], coordinates[1]
 
-        marker = Marker(symbol='diamond', size=7, color='rgb(44,160,44)')
+    def _nodedata(self, nodes, nodetype):
+        """
+        Internal function to get the coordinates and hover text
+        for nodes of one type.
 
-        # Create the nodes...
-        TCPConnectNodes = Scatter(x=TCPConnectX,
-                                  y=TCPConnectY,
-                                  mode='markers',
-                                  marker=marker,
-                                  name='TCP Connection',
-                                  text=tcpconnecttxt,
-                                  hoverinfo='text')
+        :param nodes: A list of node names of the type.
+        :param nodetype: The node type.
+        :returns: A tuple of the X coordinates, Y coordinates, and
+            hover text for the nodes.
+        """
+        nodemetadata = self.nodemetadata
+        template = self._HOVERTEXT[nodetype]
 
-        # Create the edges for the nodes...
-        TCPConnectEdges = Scatter(x=TCPConnectXe,
-                                  y=TCPConnectYe,
-                                  mode='lines',
-                                  line=Line(shape='linear',
-                                            color='rgb(44,160,44)'),
-                                  name='TCP Connect',
-                                  hoverinfo='none')
+        X, Y = self._nodecoordinates(nodes)
+        text = [template.format(nodemetadata[n]) for n in nodes]
 
-        nodes.append(TCPConnectNodes)
-        edges.append(TCPConnectEdges)
+        return X, Y, text
 
-        # URLS...
+    def _generategraph_and_annotations(self):
+        """
+        Internal function to create the output data and annotations
+        for plotly in one pass over the graph.
 
-        marker = Marker(symbol='square', size=10)
+        :returns: A tuple of the data that can be plotted with plotly
+            scatter plots, and a list of annotations for plotly.
+        """
+        # Plotly is slow to import, so only import it to plot...
+        from plotly.graph_objs import Scatter, Annotations, Annotation
 
-        # Create the nodes...
-        URLNodes = Scatter(x=URLX,
-                           y=URLY,
-                           mode='markers',
-                           marker=marker,
-                           name='URL',
-                           text=urltxt,
-                           hoverinfo='text')
+        # Only the traces of this plot share markers and lines...
+        self._markers = dict()
+        self._lines = dict()
 
-        nodes.append(URLNodes)
+        nodemetadata = self.nodemetadata
+        hovertext = self._HOVERTEXT
 
-        # Create the edges for the nodes...
-        URLEdges = Scatter(x=URLXe,
-                           y=URLYe,
-                           mode='lines',
-                           line=Line(shape='linear'),
-                           name='URL Connect',
-                           hoverinfo='none')
+        pos = self.pos
+        annotationtext = self._ANNOTATIONTEXT
+        annotations = Annotations()
 
-        edges.append(URLEdges)
+        # Bucket the nodes by type, annotating the ones that need it...
+        nodetypes = self._ntype
+        buckets = defaultdict(list)
+        for node in self.digraph:
+            nodetype = nodetypes[node]
+            buckets[nodetype].append(node)
+            if nodetype in annotationtext:
+                text = annotationtext[nodetype].format(nodemetadata[node])
+                annotations.append(
+                    Annotation(
+                        text=text,
+                        x=pos[node][0],
+                        y=pos[node][1],
+                        xref='x',
+                        yref='y',
+                        showarrow=True,
+                        ax=-40,
+                        ay=-40
+                        )
+                    )
 
-        # FILES...
+        # Node coordinates and hover text...
+        ProcessX, ProcessY = self._nodecoordinates(buckets['PID'])
+        proctxt = [hovertext['PID'].format(
+                       nodemetadata[n],
+                       nodemetadata[n].get('cmdline', "Not Available"))
+                   for n in buckets['PID']]
+
+        # Registry value nodes take their text from the linked node...
+        RegistryX, RegistryY = self._nodecoordinates(buckets['REGISTRY'])
+        registrytxt = [hovertext['REGISTRY'].format(
+                           nodemetadata[nodemetadata[n]['link']])
+                       for n in buckets['REGISTRY']]
+
+        HostX, HostY, hosttxt = self._nodedata(buckets['HOST'], 'HOST')
+
+        ServerX, ServerY, servertxt = \
+            self._nodedata(buckets['SERVERCONNECT'], 'SERVERCONNECT')
+
+        IPConnX, IPConnY, ipconntxt = \
+            self._nodedata(buckets['IPCONNECT'], 'IPCONNECT')
+
+        IPX, IPY, iptxt = self._nodedata(buckets['IP'], 'IP')
+
+        SocketX, SocketY, sockettxt = \
+            self._nodedata(buckets['SOCKET'], 'SOCKET')
+
+        TCPConnectX, TCPConnectY, tcpconnecttxt = \
+            self._nodedata(buckets['TCPCONNECT'], 'TCPCONNECT')
+
+        FileX, FileY, filetxt = self._nodedata(buckets['FILE'], 'FILE')
+
+        FileCreateX, FileCreateY, filecreatetxt = \
+            self._nodedata(buckets['FILECREATE'], 'FILECREATE')
+
+        FileWriteX, FileWriteY, filewritetxt = \
+            self._nodedata(buckets['FILEWRITE'], 'FILEWRITE')
+
+        FileCopyX, FileCopyY, filecopytxt = \
+            self._nodedata(buckets['FILECOPY'], 'FILECOPY')
+
+        FileDeleteX, FileDeleteY, filedeletetxt = \
+            self._nodedata(buckets['FILEDELETE'], 'FILEDELETE')
+
+        FileMoveX, FileMoveY, filemovetxt = \
+            self._nodedata(buckets['FILEMOVE'], 'FILEMOVE')
+
+        FileReadX, FileReadY, filereadtxt = \
+            self._nodedata(buckets['FILEREAD'], 'FILEREAD')
+
+        RegistryWriteX, RegistryWriteY, registrywritetxt = \
+            self._nodedata(buckets['REGISTRYWRITE'], 'REGISTRYWRITE')
+
+        RegistryDeleteX, RegistryDeleteY, registrydeletetxt = \
+            self._nodedata(buckets['REGISTRYDELETE'], 'REGISTRYDELETE')
+
+        RegistryCreateX, RegistryCreateY, registrycreatetxt = \
+            self._nodedata(buckets['REGISTRYCREATE'], 'REGISTRYCREATE')
+
+        RegistryReadX, RegistryReadY, registryreadtxt = \
+            self._nodedata(buckets['REGISTRYREAD'], 'REGISTRYREAD')
+
+        URLX, URLY, urltxt = self._nodedata(buckets['URL'], 'URL')
+
+        # Edge categories, by the types of the nodes they join...
+        (PROCESS, GETNAME, DNS, SOCKET, TCPCONNECT, FILECREATE, LOADIMAGE,
+         FILEWRITE, FILECOPY, FILEDELETE, FILEMOVE, FILEREAD, REGISTRYWRITE,
+         REGISTRYDELETE, REGISTRYCREATE, REGISTRYREAD, URL, SERVER,
+         IPCONN) = range(19)
+        edgecategories = {
+            ('PID', 'PID'): PROCESS,
+            ('PID', 'HOST'): GETNAME,
+            ('PID', 'SERVERCONNECT'): SERVER,
+            ('SERVERCONNECT', 'HOST'): SERVER,
+            ('PID', 'IPCONNECT'): IPCONN,
+            ('IPCONNECT', 'IP'): IPCONN,
+            ('HOST', 'IP'): DNS,
+            ('PID', 'SOCKET'): SOCKET,
+            ('SOCKET', 'TCPCONNECT'): TCPCONNECT,
+            ('TCPCONNECT', 'IP'): TCPCONNECT,
+            ('PID', 'FILECREATE'): FILECREATE,
+            ('FILECREATE', 'FILE'): FILECREATE,
+            ('PID', 'FILEWRITE'): FILEWRITE,
+            ('FILEWRITE', 'FILE'): FILEWRITE,
+            ('FILE', 'PID'): LOADIMAGE,
+            ('PID', 'FILECOPY'): FILECOPY,
+            ('FILECOPY', 'FILE'): FILECOPY,
+            ('PID', 'FILEDELETE'): FILEDELETE,
+            ('FILEDELETE', 'FILE'): FILEDELETE,
+            ('PID', 'FILEMOVE'): FILEMOVE,
+            ('FILEMOVE', 'FILE'): FILEMOVE,
+            ('PID', 'FILEREAD'): FILEREAD,
+            ('FILEREAD', 'FILE'): FILEREAD,
+            ('PID', 'REGISTRYWRITE'): REGISTRYWRITE,
+            ('REGISTRYWRITE', 'REGISTRY'): REGISTRYWRITE,
+            ('PID', 'REGISTRYDELETE'): REGISTRYDELETE,
+            ('REGISTRYDELETE', 'REGISTRY'): REGISTRYDELETE,
+            ('PID', 'REGISTRYCREATE'): REGISTRYCREATE,
+            ('REGISTRYCREATE', 'REGISTRY'): REGISTRYCREATE,
+            ('PID', 'REGISTRYREAD'): REGISTRYREAD,
+            ('REGISTRYREAD', 'REGISTRY'): REGISTRYREAD,
+            ('PID', 'URL'): URL
+            }
+
+        # Traverse edges into arrays sized up front, of the positions
+        # array rows for the ends of each edge, and of the category of
+        # each edge (-1 for edges that are not drawn)...
+        nodeindex = self._nodeindex
+        edgelist = list(self.digraph.edges())
+        numedges = len(edgelist)
+        edgeends = numpy.fromiter(
+            map(nodeindex.__getitem__,
+                itertools.chain.from_iterable(edgelist)),
+            dtype=numpy.intp,
+            count=2 * numedges).reshape(-1, 2)
+        # Zipping the iterator with itself pairs up the end types...
+        endtypes = iter(map(nodetypes.__getitem__,
+                            itertools.chain.from_iterable(edgelist)))
+        edgecategory = numpy.fromiter(
+            map(edgecategories.get, zip(endtypes, endtypes),
+                itertools.repeat(-1)),
+            dtype=numpy.intp,
+            count=numedges)
 
-        marker = Marker(symbol='hexagon', size=10)
+        # Edge coordinates...
+        ProcessXe, ProcessYe = \
+            self._edgecoordinates(edgeends, edgecategory, PROCESS)
+        GetNameXe, GetNameYe = \
+            self._edgecoordinates(edgeends, edgecategory, GETNAME)
+        DNSXe, DNSYe = \
+            self._edgecoordinates(edgeends, edgecategory, DNS)
+        SocketXe, SocketYe = \
+            self._edgecoordinates(edgeends, edgecategory, SOCKET)
+        TCPConnectXe, TCPConnectYe = \
+            self._edgecoordinates(edgeends, edgecategory, TCPCONNECT)
+        FileCreateXe, FileCreateYe = \
+            self._edgecoordinates(edgeends, edgecategory, FILECREATE)
+        LoadImageXe, LoadImageYe = \
+            self._edgecoordinates(edgeends, edgecategory, LOADIMAGE)
+        FileWriteXe, FileWriteYe = \
+            self._edgecoordinates(edgeends, edgecategory, FILEWRITE)
+        FileCopyXe, FileCopyYe = \
+            self._edgecoordinates(edgeends, edgecategory, FILECOPY)
+        FileDeleteXe, FileDeleteYe = \
+            self._edgecoordinates(edgeends, edgecategory, FILEDELETE)
+        FileMoveXe, FileMoveYe = \
+            self._edgecoordinates(edgeends, edgecategory, FILEMOVE)
+        FileReadXe, FileReadYe = \
+            self._edgecoordinates(edgeends, edgecategory, FILEREAD)
+        RegistryWriteXe, RegistryWriteYe = \
+            self._edgecoordinates(edgeends, edgecategory, REGISTRYWRITE)
+        RegistryDeleteXe, RegistryDeleteYe = \
+            self._edgecoordinates(edgeends, edgecategory, REGISTRYDELETE)
+        RegistryCreateXe, RegistryCreateYe = \
+            self._edgecoordinates(edgeends, edgecategory, REGISTRYCREATE)
+        RegistryReadXe, RegistryReadYe = \
+            self._edgecoordinates(edgeends, edgecategory, REGISTRYREAD)
+        URLXe, URLYe = \
+            self._edgecoordinates(edgeends, edgecategory, URL)
+        ServerXe, ServerYe = \
+            self._edgecoordinates(edgeends, edgecategory, SERVER)
+        IPConnXe, IPConnYe = \
+            self._edgecoordinates(edgeends, edgecategory, IPCONN)
+
+        nodes = []
+        edges = []
+
+        # PROCESSES...
+
+        marker = self._marker('circle', 10)
 
         # Create the nodes...
-        FileNodes = Scatter(x=FileX,
-                            y=FileY,
-                            mode='markers',
-                            marker=marker,
-                            name='File',
-                            text=filetxt,
-                            hoverinfo='text')
+        if len(ProcessX) > 0:
+            ProcNodes = Scatter(x=ProcessX,
+                                y=ProcessY,
+                                mode='markers',
+                                marker=marker,
+                                name='Process',
+                                text=proctxt,
+                                hoverinfo='text')
+            nodes.append(ProcNodes)
 
-        nodes.append(FileNodes)
+        # Create the edges for the nodes...
+        if len(ProcessXe) > 0:
+            ProcEdges = Scatter(x=ProcessXe,
+                                y=ProcessYe,
+                                mode='lines',
+                                line=self._line(color='rgb(214,39,20)'),
+                                name='Process Start',
+                                hoverinfo='none')
+            edges.append(ProcEdges)
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(123,102,210)')
+        # HOSTS...
+
+        marker = self._marker('square', 10)
 
         # Create the nodes...
-        FileCreateNodes = Scatter(x=FileCreateX,
-                                  y=FileCreateY,
+        if len(HostX) > 0:
+            HostNodes = Scatter(x=HostX,
+                                y=HostY,
+                                mode='markers',
+                                marker=marker,
+                                name='Host',
+                                text=hosttxt,
+                                hoverinfo='text')
+            nodes.append(HostNodes)
+
+        # Create the edges for the nodes...
+        if len(GetNameXe) > 0:
+            GetNameEdges = Scatter(x=GetNameXe,
+                                   y=GetNameYe,
+                                   mode='lines',
+                                   line=self._line(color='rgb(174,199,232)'),
+                                   name='DNS Query',
+                                   hoverinfo='none')
+            edges.append(GetNameEdges)
+
+        # SERVERS...
+
+        marker = self._marker('diamond', 7)
+
+        # Create the nodes...
+        if len(ServerX) > 0:
+            ServerNodes = Scatter(x=ServerX,
+                                  y=ServerY,
                                   mode='markers',
                                   marker=marker,
-                                  name='File Create',
-                                  text=filecreatetxt,
+                                  name='Server Connections',
+                                  text=servertxt,
                                   hoverinfo='text')
-
-        nodes.append(FileCreateNodes)
+            nodes.append(ServerNodes)
 
         # Create the edges for the nodes...
-        FileCreateEdges = Scatter(x=FileCreateXe,
-                                  y=FileCreateYe,
+        if len(ServerXe) > 0:
+            ServerEdges = Scatter(x=ServerXe,
+                                  y=ServerYe,
                                   mode='lines',
-                                  line=Line(shape='linear',
-                                            color='rgb(123,102,210)'),
-                                  name='File Create',
+                                  line=self._line(),
+                                  name='Server Connect',
                                   hoverinfo='none')
+            edges.append(ServerEdges)
 
-        edges.append(FileCreateEdges)
+        # IP CONNECTS...
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(255,187,120)')
+        marker = self._marker('diamond', 7)
 
         # Create the nodes...
-        FileWriteNodes = Scatter(x=FileWriteX,
-                                 y=FileWriteY,
-                                 mode='markers',
-                                 marker=marker,
-                                 name='File Write',
-                                 text=filewritetxt,
-                                 hoverinfo='text')
-
-        nodes.append(FileWriteNodes)
+        if len(IPConnX) > 0:
+            IPConnNodes = Scatter(x=IPConnX,
+                                  y=IPConnY,
+                                  mode='markers',
+                                  marker=marker,
+                                  name='IP Connections',
+                                  text=ipconntxt,
+                                  hoverinfo='text')
+            nodes.append(IPConnNodes)
 
         # Create the edges for the nodes...
-        FileWriteEdges = Scatter(x=FileWriteXe,
-                                 y=FileWriteYe,
-                                 mode='lines',
-                                 line=Line(shape='linear',
-                                           color='rgb(255,187,120)'),
-                                 name='File Write',
-                                 hoverinfo='none')
+        if len(IPConnXe) > 0:
+            IPConnEdges = Scatter(x=IPConnXe,
+                                  y=IPConnYe,
+                                  mode='lines',
+                                  line=self._line(),
+                                  name='IP Connect',
+                                  hoverinfo='none')
+            edges.append(IPConnEdges)
 
-        edges.append(FileWriteEdges)
+        # IPS...
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(65,68,81)')
+        marker = self._marker('square', 10)
 
         # Create the nodes...
-        FileCopyNodes = Scatter(x=FileCopyX,
-                                y=FileCopyY,
-                                mode='markers',
-                                marker=marker,
-                                name='File Copy',
-                                text=filecopytxt,
-                                hoverinfo='text')
-
-        nodes.append(FileCopyNodes)
+        if len(IPX) > 0:
+            IPNodes = Scatter(x=IPX,
+                              y=IPY,
+                              mode='markers',
+                              marker=marker,
+                              name='IP',
+                              text=iptxt,
+                              hoverinfo='text')
+            nodes.append(IPNodes)
 
         # Create the edges for the nodes...
-        FileCopyEdges = Scatter(x=FileCopyXe,
-                                y=FileCopyYe,
-                                mode='lines',
-                                line=Line(shape='linear',
-                                          color='rgb(65,68,81)'),
-                                name='File Copy',
-                                hoverinfo='none')
+        if len(DNSXe) > 0:
+            DNSEdges = Scatter(x=DNSXe,
+                               y=DNSYe,
+                               mode='lines',
+                               line=self._line(color='rgb(23,190,207)'),
+                               name='DNS Response',
+                               hoverinfo='none')
+            edges.append(DNSEdges)
 
-        edges.append(FileCopyEdges)
+        # SOCKETS...
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(255,128,14)')
+        marker = self._marker('diamond', 7, 'rgb(277,119,194)')
 
         # Create the nodes...
-        FileDeleteNodes = Scatter(x=FileDeleteX,
-                                  y=FileDeleteY,
+        if len(SocketX) > 0:
+            SocketNodes = Scatter(x=SocketX,
+                                  y=SocketY,
                                   mode='markers',
                                   marker=marker,
-                                  name='File Delete',
-                                  text=filedeletetxt,
+                                  name='Socket',
+                                  text=sockettxt,
                                   hoverinfo='text')
-
-        nodes.append(FileDeleteNodes)
+            nodes.append(SocketNodes)
 
         # Create the edges for the nodes...
-        FileDeleteEdges = Scatter(x=FileDeleteXe,
-                                  y=FileDeleteYe,
+        if len(SocketXe) > 0:
+            SocketEdges = Scatter(x=SocketXe,
+                                  y=SocketYe,
                                   mode='lines',
-                                  line=Line(shape='linear',
-                                            color='rgb(255,128,14)'),
-                                  name='File Delete',
+                                  line=self._line(color='rgb(227,119,194)'),
+                                  name='Create Socket',
                                   hoverinfo='none')
+            edges.append(SocketEdges)
 
-        edges.append(FileDeleteEdges)
+        # TCP CONNECTS...
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(171,171,171)')
+        marker = self._marker('diamond', 7, 'rgb(44,160,44)')
 
         # Create the nodes...
-        FileMoveNodes = Scatter(x=FileMoveX,
-                                y=FileMoveY,
-                                mode='markers',
-                                marker=marker,
-                                name='File Move',
-                                text=filemovetxt,
-                                hoverinfo='text')
-
-        nodes.append(FileMoveNodes)
+        if len(TCPConnectX) > 0:
+            TCPConnectNodes = Scatter(x=TCPConnectX,
+                                      y=TCPConnectY,
+                                      mode='markers',
+                                      marker=marker,
+                                      name='TCP Connection',
+                                      text=tcpconnecttxt,
+                                      hoverinfo='text')
+            nodes.append(TCPConnectNodes)
 
         # Create the edges for the nodes...
-        FileMoveEdges = Scatter(x=FileMoveXe,
-                                y=FileMoveYe,
-                                mode='lines',
-                                line=Line(shape='linear',
-                                          color='rgb(171,171,171)'),
-                                name='File Move',
-                                hoverinfo='none')
+        if len(TCPConnectXe) > 0:
+            TCPConnectEdges = Scatter(x=TCPConnectXe,
+                                      y=TCPConnectYe,
+                                      mode='lines',
+                                      line=self._line(color='rgb(44,160,44)'),
+                                      name='TCP Connect',
+                                      hoverinfo='none')
+            edges.append(TCPConnectEdges)
 
-        edges.append(FileMoveEdges)
+        # URLS...
 
-        marker = Marker(symbol='triangle-up', size=7,
-                        color='rgb(207,207,207)')
+        marker = self._marker('square', 10)
 
         # Create the nodes...
-        FileReadNodes = Scatter(x=FileReadX,
-                                y=FileReadY,
-                                mode='markers',
-                                marker=marker,
-                                name='File Read',
-                                text=filereadtxt,
-                                hoverinfo='text')
-
-        nodes.append(FileReadNodes)
+        if len(URLX) > 0:
+            URLNodes = Scatter(x=URLX,
+                               y=URLY,
+                               mode='markers',
+                               marker=marker,
+                               name='URL',
+                               text=urltxt,
+                               hoverinfo='text')
+            nodes.append(URLNodes)
 
         # Create the edges for the nodes...
-        FileReadEdges = Scatter(x=FileReadXe,
-                                y=FileReadYe,
-                                mode='lines',
-                                line=Line(shape='linear',
-                                          color='rgb(207,207,207)'),
-                                name='File Read',
-                                hoverinfo='none')
-
-        edges.append(FileReadEdges)
-
-        # Create the edges for the nodes...
-        LoadImageEdges = Scatter(x=LoadImageXe,
-                                 y=LoadImageYe,
-                                 mode='lines',
-                                 line=Line(shape='linear',
-                                           dash='dot'),
-                                 name='Process Load Image',
-                                 hoverinfo='none')
-
-        edges.append(LoadImageEdges)
+        if len(URLXe) > 0:
+            URLEdges = Scatter(x=URLXe,
+                               y=URLYe,
+                               mode='lines',
+                               line=self._line(),
+                               name='URL Connect',
+                               hoverinfo='none')
+            edges.append(URLEdges)
 
-        # REGISTRY...
+        # FILES...
 
-        marker = Marker(symbol='star', size=10)
+        marker = self._marker('hexagon', 10)
 
         # Create the nodes...
-        RegistryNodes = Scatter(x=RegistryX,
-                                y=RegistryY,
+        if len(FileX) > 0:
+            FileNodes = Scatter(x=FileX,
+                                y=FileY,
                                 mode='markers',
                                 marker=marker,
-                                name='Registry',
-                                text=registrytxt,
+                                name='File',
+                                text=filetxt,
                                 hoverinfo='text')
+            nodes.append(FileNodes)
+
+        marker = self._marker('triangle-down', 7, 'rgb(123,102,210)')
+
+        # Create the nodes...
+        if len(FileCreateX) > 0:
+            FileCreateNodes = Scatter(x=FileCreateX,
+                                      y=FileCreateY,
+                                      mode='markers',
+                                      marker=marker,
+                                      name='File Create',
+                                      text=filecreatetxt,
+                                      hoverinfo='text')
+            nodes.append(FileCreateNodes)
 
-        nodes.append(RegistryNodes)
+        # Create the edges for the nodes...
+        if len(FileCreateXe) > 0:
+            FileCreateEdges = Scatter(x=FileCreateXe,
+                                      y=FileCreateYe,
+                                      mode='lines',
+                                      line=self._line(
+                                          color='rgb(123,102,210)'),
+                                      name='File Create',
+                                      hoverinfo='none')
+            edges.append(FileCreateEdges)
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(255,187,120)')
+        marker = self._marker('triangle-down', 7, 'rgb(255,187,120)')
 
         # Create the nodes...
-        RegistryWriteNodes = Scatter(x=RegistryWriteX,
-                                     y=RegistryWriteY,
+        if len(FileWriteX) > 0:
+            FileWriteNodes = Scatter(x=FileWriteX,
+                                     y=FileWriteY,
                                      mode='markers',
                                      marker=marker,
-                                     name='Registry Write',
-                                     text=registrywritetxt,
+                                     name='File Write',
+                                     text=filewritetxt,
                                      hoverinfo='text')
-
-        nodes.append(RegistryWriteNodes)
+            nodes.append(FileWriteNodes)
 
         # Create the edges for the nodes...
-        RegistryWriteEdges = Scatter(x=RegistryWriteXe,
-                                     y=RegistryWriteYe,
+        if len(FileWriteXe) > 0:
+            FileWriteEdges = Scatter(x=FileWriteXe,
+                                     y=FileWriteYe,
                                      mode='lines',
-                                     line=Line(shape='linear',
-                                               color='rgb(255,187,120)'),
-                                     name='Registry Write',
+                                     line=self._line(color='rgb(255,187,120)'),
+                                     name='File Write',
                                      hoverinfo='none')
+            edges.append(FileWriteEdges)
 
-        edges.append(RegistryWriteEdges)
+        marker = self._marker('triangle-down', 7, 'rgb(65,68,81)')
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(255,128,14)')
+        # Create the nodes...
+        if len(FileCopyX) > 0:
+            FileCopyNodes = Scatter(x=FileCopyX,
+                                    y=FileCopyY,
+                                    mode='markers',
+                                    marker=marker,
+                                    name='File Copy',
+                                    text=filecopytxt,
+                                    hoverinfo='text')
+            nodes.append(FileCopyNodes)
+
+        # Create the edges for the nodes...
+        if len(FileCopyXe) > 0:
+            FileCopyEdges = Scatter(x=FileCopyXe,
+                                    y=FileCopyYe,
+                                    mode='lines',
+                                    line=self._line(color='rgb(65,68,81)'),
+                                    name='File Copy',
+                                    hoverinfo='none')
+            edges.append(FileCopyEdges)
+
+        marker = self._marker('triangle-down', 7, 'rgb(255,128,14)')
 
         # Create the nodes...
-        RegistryDeleteNodes = Scatter(x=RegistryDeleteX,
-                                      y=RegistryDeleteY,
+        if len(FileDeleteX) > 0:
+            FileDeleteNodes = Scatter(x=FileDeleteX,
+                                      y=FileDeleteY,
                                       mode='markers',
                                       marker=marker,
-                                      name='Registry Delete',
-                                      text=registrydeletetxt,
+                                      name='File Delete',
+                                      text=filedeletetxt,
                                       hoverinfo='text')
-
-        nodes.append(RegistryDeleteNodes)
+            nodes.append(FileDeleteNodes)
 
         # Create the edges for the nodes...
-        RegistryDeleteEdges = Scatter(x=RegistryDeleteXe,
-                                      y=RegistryDeleteYe,
+        if len(FileDeleteXe) > 0:
+            FileDeleteEdges = Scatter(x=FileDeleteXe,
+                                      y=FileDeleteYe,
                                       mode='lines',
-                                      line=Line(shape='linear',
-                                                color='rgb(255,128,14)'),
-                                      name='Registry Delete',
+                                      line=self._line(color='rgb(255,128,14)'),
+                                      name='File Delete',
                                       hoverinfo='none')
+            edges.append(FileDeleteEdges)
 
-        edges.append(RegistryDeleteEdges)
+        marker = self._marker('triangle-down', 7, 'rgb(171,171,171)')
+
+        # Create the nodes...
+        if len(FileMoveX) > 0:
+            FileMoveNodes = Scatter(x=FileMoveX,
+                                    y=FileMoveY,
+                                    mode='markers',
+                                    marker=marker,
+                                    name='File Move',
+                                    text=filemovetxt,
+                                    hoverinfo='text')
+            nodes.append(FileMoveNodes)
+
+        # Create the edges for the nodes...
+        if len(FileMoveXe) > 0:
+            FileMoveEdges = Scatter(x=FileMoveXe,
+                                    y=FileMoveYe,
+                                    mode='lines',
+                                    line=self._line(color='rgb(171,171,171)'),
+                                    name='File Move',
+                                    hoverinfo='none')
+            edges.append(FileMoveEdges)
 
-        marker = Marker(symbol='triangle-down', size=7,
-                        color='rgb(123,102,210)')
+        marker = self._marker('triangle-up', 7, 'rgb(207,207,207)')
 
         # Create the nodes...
-        RegistryCreateNodes = Scatter(x=RegistryCreateX,
-                                      y=RegistryCreateY,
-                                      mode='markers',
-                                      marker=marker,
-                                      name='Registry Create',
-                                      text=registrycreatetxt,
-                                      hoverinfo='text')
+        if len(FileReadX) > 0:
+            FileReadNodes = Scatter(x=FileReadX,
+                                    y=FileReadY,
+                                    mode='markers',
+                                    marker=marker,
+                                    name='File Read',
+                                    text=filereadtxt,
+                                    hoverinfo='text')
+            nodes.append(FileReadNodes)
 
-        nodes.append(RegistryCreateNodes)
+        # Create the edges for the nodes...
+        if len(FileReadXe) > 0:
+            FileReadEdges = Scatter(x=FileReadXe,
+                                    y=FileReadYe,
+                                    mode='lines',
+                                    line=self._line(color='rgb(207,207,207)'),
+                                    name='File Read',
+                                    hoverinfo='none')
+            edges.append(FileReadEdges)
 
         # Create the edges for the nodes...
-        RegistryCreateEdges = Scatter(x=RegistryCreateXe,
-                                      y=RegistryCreateYe,
-                                      mode='lines',
-                                      line=Line(shape='linear',
-                                                color='rgb(123,102,210)'),
-                                      name='Registry Create',
-                                      hoverinfo='none')
+        if len(LoadImageXe) > 0:
+            LoadImageEdges = Scatter(x=LoadImageXe,
+                                     y=LoadImageYe,
+                                     mode='lines',
+                                     line=self._line(dash='dot'),
+                                     name='Process Load Image',
+                                     hoverinfo='none')
+            edges.append(LoadImageEdges)
 
-        edges.append(RegistryCreateEdges)
+        # REGISTRY...
 
-        marker = Marker(symbol='triangle-up', size=7,
-                        color='rgb(207,207,207)')
+        marker = self._marker('star', 10)
 
         # Create the nodes...
-        RegistryReadNodes = Scatter(x=RegistryReadX,
-                                    y=RegistryReadY,
+        if len(RegistryX) > 0:
+            RegistryNodes = Scatter(x=RegistryX,
+                                    y=RegistryY,
                                     mode='markers',
                                     marker=marker,
-                                    name='Registry Read',
-                                    text=registryreadtxt,
+                                    name='Registry',
+                                    text=registrytxt,
                                     hoverinfo='text')
+            nodes.append(RegistryNodes)
 
-        nodes.append(RegistryReadNodes)
+        marker = self._marker('triangle-down', 7, 'rgb(255,187,120)')
+
+        # Create the nodes...
+        if len(RegistryWriteX) > 0:
+            RegistryWriteNodes = Scatter(x=RegistryWriteX,
+                                         y=RegistryWriteY,
+                                         mode='markers',
+                                         marker=marker,
+                                         name='Registry Write',
+                                         text=registrywritetxt,
+                                         hoverinfo='text')
+            nodes.append(RegistryWriteNodes)
 
         # Create the edges for the nodes...
-        RegistryReadEdges = Scatter(x=RegistryReadXe,
-                                    y=RegistryReadYe,
-                                    mode='lines',
-                                    line=Line(shape='linear',
-                                              color='rgb(207,207,207)'),
-                                    name='File Read',
-                                    hoverinfo='none')
+        if len(RegistryWriteXe) > 0:
+            RegistryWriteEdges = Scatter(x=RegistryWriteXe,
+                                         y=RegistryWriteYe,
+                                         mode='lines',
+                                         line=self._line(
+                                             color='rgb(255,187,120)'),
+                                         name='Registry Write',
+                                         hoverinfo='none')
+            edges.append(RegistryWriteEdges)
+
+        marker = self._marker('triangle-down', 7, 'rgb(255,128,14)')
 
-        edges.append(RegistryReadEdges)
+        # Create the nodes...
+        if len(RegistryDeleteX) > 0:
+            RegistryDeleteNodes = Scatter(x=RegistryDeleteX,
+                                          y=RegistryDeleteY,
+                                          mode='markers',
+                                          marker=marker,
+                                          name='Registry Delete',
+                                          text=registrydeletetxt,
+                                          hoverinfo='text')
+            nodes.append(RegistryDeleteNodes)
 
-        # Reverse the order and mush...
-        output = []
-        output += edges[::-1]
-        output += nodes[::-1]
+        # Create the edges for the nodes...
+        if len(RegistryDeleteXe) > 0:
+            RegistryDeleteEdges = Scatter(x=RegistryDeleteXe,
+                                          y=RegistryDeleteYe,
+                                          mode='lines',
+                                          line=self._line(
+                                              color='rgb(255,128,14)'),
+                                          name='Registry Delete',
+                                          hoverinfo='none')
+            edges.append(RegistryDeleteEdges)
+
+        marker = self._marker('triangle-down', 7, 'rgb(123,102,210)')
 
-        # Return the plot data...
-        return output
+        # Create the nodes...
+        if len(RegistryCreateX) > 0:
+            RegistryCreateNodes = Scatter(x=RegistryCreateX,
+                                          y=RegistryCreateY,
+                                          mode='markers',
+                                          marker=marker,
+                                          name='Registry Create',
+                                          text=registrycreatetxt,
+                                          hoverinfo='text')
+            nodes.append(RegistryCreateNodes)
 
-    def _generateannotations(self):
-        """
-        Internal function to generate annotations on the graph.
+        # Create the edges for the nodes...
+        if len(RegistryCreateXe) > 0:
+            RegistryCreateEdges = Scatter(x=RegistryCreateXe,
+                                          y=RegistryCreateYe,
+                                          mode='lines',
+                                          line=self._line(
+                                              color='rgb(123,102,210)'),
+                                          name='Registry Create',
+                                          hoverinfo='none')
+            edges.append(RegistryCreateEdges)
+
+        marker = self._marker('triangle-up', 7, 'rgb(207,207,207)')
 
-        :returns: A list of annotations for plotly.
-        """
-        annotations = Annotations()
+        # Create the nodes...
+        if len(RegistryReadX) > 0:
+            RegistryReadNodes = Scatter(x=RegistryReadX,
+                                        y=RegistryReadY,
+                                        mode='markers',
+                                        marker=marker,
+                                        name='Registry Read',
+                                        text=registryreadtxt,
+                                        hoverinfo='text')
+            nodes.append(RegistryReadNodes)
 
-        for node in self.digraph:
-            if self.digraph.node[node]['type'] == 'PID':
-                annotations.append(
-                    Annotation(
-                        text="{0}<br>PID: {1}".format(
-                            self.nodemetadata[node]['name'],
-                            self.nodemetadata[node]['pid']
-                            ),
-                        x=self.pos[node][0],
-                        y=self.pos[node][1],
-                        xref='x',
-                        yref='y',
-                        showarrow=True,
-                        ax=-40,
-                        ay=-40
-                        )
-                    )
-            if self.digraph.node[node]['type'] == 'HOST':
-                annotations.append(
-                    Annotation(
-                        text="HOST: {0}".format(
-                            self.nodemetadata[node]['host']
-                            ),
-                        x=self.pos[node][0],
-                        y=self.pos[node][1],
-                        xref='x',
-                        yref='y',
-                        showarrow=True,
-                        ax=-40,
-                        ay=-40
-                        )
-                    )
-            if self.digraph.node[node]['type'] == 'IP':
-                annotations.append(
-                    Annotation(
-                        text="IP: {0}".format(
-                            self.nodemetadata[node]['ip']
-                            ),
-                        x=self.pos[node][0],
-                        y=self.pos[node][1],
-                        xref='x',
-                        yref='y',
-                        showarrow=True,
-                        ax=-40,
-                        ay=-40
-                        )
-                    )
+        # Create the edges for the nodes...
+        if len(RegistryReadXe) > 0:
+            RegistryReadEdges = Scatter(x=RegistryReadXe,
+                                        y=RegistryReadYe,
+                                        mode='lines',
+                                        line=self._line(
+                                            color='rgb(207,207,207)'),
+                                        name='File Read',
+                                        hoverinfo='none')
+            edges.append(RegistryReadEdges)
 
-        return annotations
+        # Reverse the order and mush...
+        output = []
+        output += edges[::-1]
+        output += nodes[::-1]
+
+        # Return the plot data and annotations...
+        return output, annotations
 
     def plotgraph(self,
                   graphvizprog='sfdp',
                   filename='temp-plot.html',
                   title=None, auto_open=True,
                   image=None, image_filename='plot_image',
-                  image_height=600, image_width=800):
+                  image_height=600, image_width=800,
+                  cache_positions=True, layout_algo=None):
         """
 
         Function to plot the graph of the ProcMon CSV.
@@ -2349,16 +2611,36 @@ class CuckooJSONReport(object):
         :param image_filename: The file name for the exported image.
         :param image_height: The number of pixels for the image height.
         :param image_width: The number of pixels for the image width.
+        :param cache_positions: Set to False to always lay out the graph
+            again, instead of reusing positions cached on disk by an
+            earlier plot of the same graph and layout.  The cache is
+            kept in positioncachedir, ~/.cache/visualize_logs by
+            default.
+        :param layout_algo: The networkx layout algorithm to use when
+            graphvizprog is None, valid options are 'spring' and
+            'forceatlas2'.  If this value is None, 'forceatlas2' is
+            used for graphs with 500 or more nodes when the fa2 package
+            is installed, and 'spring' otherwise.  'forceatlas2' needs
+            the fa2 package or networkx 3.4 or newer, otherwise
+            'spring' is used.  fa2 does not work with networkx 3, so
+            'spring' is also used if it fails.
         :returns: Nothing
 
         """
+        # Plotly is slow to import, so only import it to plot...
+        from plotly.offline import plot
+        from plotly.graph_objs import Figure, Layout, XAxis, YAxis
+
+        if layout_algo not in (None, 'spring', 'forceatlas2'):
+            raise Exceptions.VisualizeLogsBadFunctionInput("layout_algo")
+
         self.graphvizprog = graphvizprog
+        self.layoutalgo = layout_algo
 
         # Layout the positions...
-        self._create_positions_digraph()
+        self._create_positions_digraph(cachepositions=cache_positions)
 
-        outputdata = self._generategraph()
-        annotations = self._generateannotations()
+        outputdata, annotations = self._generategraph_and_annotations()
 
         # Hide axis line, grid, ticklabels and title...
         axis = dict(showline=False,
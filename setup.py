@@ -21,8 +21,12 @@ setup(
     description=('A Python library and command line tools to '
                  'provide log visualization.'),
     long_description=read('README.TXT'),
-    install_requires=['networkx', 'pandas', 'plotly>=1.9.0',
+    install_requires=['networkx', 'numpy', 'pandas', 'plotly>=1.9.0',
                       'pydotplus'],
+    extras_require={
+        'speedups': ['orjson', 'google-re2'],
+        'layout': ['fa2', 'networkx<3'],
+    },
     entry_points={
         'console_scripts': [
             'plotprocmoncsv = Visualize_Logs.__main__:plotprocmoncsv',
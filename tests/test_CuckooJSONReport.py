@@ -0,0 +1,447 @@
+#
+# Includes
+#
+
+# OS
+import os
+
+# Temporary directories
+import shutil
+import tempfile
+
+# Unit tests
+import unittest
+from unittest import mock
+
+# Graphs
+import networkx
+
+# Arrays
+import numpy
+
+# Process pools
+from concurrent.futures.process import BrokenProcessPool
+
+# JSON
+import json
+
+# Objects under test
+from Visualize_Logs.objects import CuckooJSONReport as reportmodule
+from Visualize_Logs.objects.CuckooJSONReport import CuckooJSONReport, \
+    _FileEventMetadata
+
+#
+# Helpers
+#
+
+
+def _process(pid, parent_id, children=None):
+    """
+    Helper to make a process tree entry.
+
+    :param pid: The process id.
+    :param parent_id: The parent process id.
+    :param children: A list of process tree entries for the children.
+    :returns: A dict like the ones in the JSON process tree.
+    """
+    return {'pid': pid,
+            'parent_id': parent_id,
+            'threads': [],
+            'name': 'process{0}.exe'.format(pid),
+            'module_path': 'C:\\process{0}.exe'.format(pid),
+            'children': children or []}
+
+
+def _report(processtree, **kwargs):
+    """
+    Helper to build a report with only processes in it.
+
+    :param processtree: A list of process tree entries.
+    :param kwargs: Extra arguments for CuckooJSONReport.
+    :returns: A CuckooJSONReport.
+    """
+    processes = []
+    pending = list(processtree)
+    while pending:
+        process = pending.pop()
+        processes.append({'process_id': process['pid'],
+                          'first_seen': '2016-11-11 00:00:00,000',
+                          'calls': []})
+        pending.extend(process['children'])
+
+    reportdict = {'behavior': {'processtree': processtree,
+                               'processes': processes}}
+
+    return CuckooJSONReport(jsonreportdict=reportdict,
+                            plotnetwork=False,
+                            plotfiles=False,
+                            plotregistry=False,
+                            **kwargs)
+
+#
+# Tests
+#
+
+
+class PathFilterTests(unittest.TestCase):
+    """Tests for the ignore and include path filters."""
+
+    def test_plain_expressions_are_joined(self):
+        report = _report([_process(1, 0)],
+                         ignorepaths=['\\.tmp$', 'temp'])
+        self.assertEqual(len(report._ignore_re), 1)
+        self.assertTrue(report._filtered('C:\\A.TMP'))
+        self.assertTrue(report._filtered('C:\\Temp\\a.txt'))
+        self.assertFalse(report._filtered('C:\\a.txt'))
+
+    def test_backreference_is_not_renumbered(self):
+        report = _report([_process(1, 0)],
+                         ignorepaths=['(x)y', '(a)\\1'])
+        self.assertTrue(report._filtered('aA'))
+        self.assertFalse(report._filtered('ax'))
+
+    def test_conditional_reference_is_not_renumbered(self):
+        report = _report([_process(1, 0)],
+                         ignorepaths=['(x)y', '(a)?(?(1)b|c)'])
+        self.assertEqual(len(report._ignore_re), 2)
+        self.assertTrue(report._filtered('ab'))
+        self.assertTrue(report._filtered('c'))
+        self.assertFalse(report._filtered('a'))
+
+    def test_global_flags_not_first(self):
+        report = _report([_process(1, 0)],
+                         ignorepaths=['foo', '(?s)a.b'])
+        self.assertTrue(report._filtered('a\nb'))
+        self.assertTrue(report._filtered('FOO'))
+
+    def test_include_overrides_ignore(self):
+        report = _report([_process(1, 0)],
+                         ignorepaths=['windows'],
+                         includepaths=['system32'])
+        self.assertTrue(report._filtered('C:\\Windows\\a.dll'))
+        self.assertFalse(report._filtered('C:\\Windows\\System32\\a.dll'))
+
+
+class ProcessTreeTests(unittest.TestCase):
+    """Tests for building the process part of the graph."""
+
+    def test_children_are_linked(self):
+        report = _report([_process(1, 0, [_process(2, 1,
+                                                   [_process(3, 2)])])])
+        self.assertTrue(report.digraph.has_edge('PID 1', 'PID 2'))
+        self.assertTrue(report.digraph.has_edge('PID 2', 'PID 3'))
+        self.assertFalse(report.digraph.has_node('PID 0'))
+
+    def test_parent_found_later_in_another_tree(self):
+        # PID 5's parent is a grandchild in the next tree...
+        report = _report([_process(5, 4),
+                          _process(1, 0, [_process(3, 1,
+                                                   [_process(4, 3)])])])
+        self.assertTrue(report.digraph.has_edge('PID 4', 'PID 5'))
+        self.assertTrue(report.digraph.has_edge('PID 3', 'PID 4'))
+        self.assertEqual(report.nodemetadata['PID 4']['children'],
+                         ['PID 5'])
+        self.assertEqual(report.nodemetadata['PID 4']['pid'], 4)
+
+
+def _call(seconds, **args):
+    """
+    Helper to make a process call that has been bucketed by API.
+
+    :param seconds: The seconds part of the timestamp.
+    :param args: The call arguments.
+    :returns: A dict like the bucketed calls.
+    """
+    return {'timestamp': '2016-11-11 00:00:{0:02d},000'.format(seconds),
+            'args': args}
+
+
+class SocketTests(unittest.TestCase):
+    """Tests for matching socket closes and connects to sockets."""
+
+    def _sockets(self, sockets, closes, connects):
+        report = _report([_process(1, 0)])
+        report._add_sockets('PID 1', {'socket': sockets,
+                                      'closesocket': closes,
+                                      'connect': connects})
+        report._flush_pending()
+
+        found = list()
+        for node in sorted(report.digraph.successors('PID 1')):
+            connected = sorted(report.nodemetadata[c]['timestamp']
+                               for c in report.digraph.successors(node))
+            found.append((report.nodemetadata[node]['closetime'],
+                          [t[-6:-4] for t in connected]))
+        return found
+
+    def test_close_at_open_time_is_not_the_close(self):
+        found = self._sockets([_call(5, socket=1)],
+                              [_call(5), _call(9)],
+                              [_call(7, socket=1, ip='1.2.3.4')])
+        self.assertEqual(found, [('2016-11-11 00:00:09,000', ['07'])])
+
+        found = self._sockets([_call(5, socket=1)], [_call(5)],
+                              [_call(7, socket=1, ip='1.2.3.4')])
+        self.assertEqual(found, [(None, ['07'])])
+
+    def test_connects_at_open_and_close_times(self):
+        found = self._sockets([_call(5, socket=1)], [_call(9)],
+                              [_call(4, socket=1, ip='1.2.3.4'),
+                               _call(5, socket=1, ip='1.2.3.4'),
+                               _call(9, socket=1, ip='1.2.3.4'),
+                               _call(10, socket=1, ip='1.2.3.4')])
+        self.assertEqual(found, [('2016-11-11 00:00:09,000',
+                                  ['05', '09'])])
+
+    def test_socket_without_close(self):
+        found = self._sockets([_call(5, socket=1)], [_call(3)],
+                              [_call(4, socket=1, ip='1.2.3.4'),
+                               _call(6, socket=2, ip='1.2.3.4'),
+                               _call(8, socket=1, ip='1.2.3.4')])
+        self.assertEqual(found, [(None, ['08'])])
+
+
+class PlotDataTests(unittest.TestCase):
+    """Tests for the plotly traces made from the graph."""
+
+    def setUp(self):
+        self.report = _report([_process(1, 0, [_process(2, 1)])])
+        self.report._emit_write('PID 1', _call(1, HandleName='C:\\a.txt'))
+        self.report._add_sockets('PID 2', {
+            'socket': [_call(5, socket=1)],
+            'connect': [_call(6, socket=1, ip='1.2.3.4')]})
+        self.report._flush_pending()
+
+        # Node i of the sorted nodes is at (i, 10 * i)...
+        pos = dict((n, (float(i), 10.0 * i))
+                   for i, n in enumerate(sorted(self.report.digraph)))
+        self.report.graphvizprog = None
+        with mock.patch.object(self.report, '_layout_components',
+                               return_value=pos):
+            self.report._create_positions_digraph(cachepositions=False)
+
+        data, annotations = self.report._generategraph_and_annotations()
+        self.traces = dict(((t['name'], t['mode']), t) for t in data)
+        self.names = [t['name'] for t in data]
+
+    def test_traces(self):
+        self.assertEqual(self.names,
+                         ['File Write', 'TCP Connect', 'Create Socket',
+                          'Process Start', 'File Write', 'File',
+                          'TCP Connection', 'Socket', 'IP', 'Process'])
+        self.assertNotIn('Registry Write', self.names)
+        self.assertNotIn('DNS Query', self.names)
+
+    def test_edge_coordinates(self):
+        # PID 2 -> SOCKET 1 -> TCP CONNECT 2 -> IP...
+        trace = self.traces[('TCP Connect', 'lines')]
+        numpy.testing.assert_array_equal(
+            trace['x'], [5.0, 6.0, numpy.nan, 6.0, 1.0, numpy.nan])
+        numpy.testing.assert_array_equal(
+            trace['y'], [50.0, 60.0, numpy.nan, 60.0, 10.0, numpy.nan])
+
+    def test_markers_and_lines_are_not_shared_between_plots(self):
+        markers = self.report._markers
+        lines = self.report._lines
+        self.assertTrue(markers)
+        self.report._generategraph_and_annotations()
+        self.assertIsNot(self.report._markers, markers)
+        self.assertIsNot(self.report._lines, lines)
+        self.assertIsNone(_report([_process(1, 0)])._markers)
+
+    def test_node_coordinates(self):
+        trace = self.traces[('Process', 'markers')]
+        self.assertEqual(list(trace['x']), [3.0, 4.0])
+        self.assertEqual(list(trace['y']), [30.0, 40.0])
+
+
+class PositionCacheTests(unittest.TestCase):
+    """Tests for the layout position cache."""
+
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp()
+        self.report = _report([_process(1, 0, [_process(2, 1),
+                                               _process(3, 1)])])
+        self.report.positioncachedir = self.cachedir
+        self.report.graphvizprog = None
+        self.report.pos = {'PID 1': (0.0, 1.0),
+                           'PID 2': (2.0, 3.0),
+                           'PID 3': (4.0, 5.0)}
+
+    def tearDown(self):
+        shutil.rmtree(self.cachedir)
+
+    def test_positions_round_trip(self):
+        cachefile = self.report._position_cache_file()
+        self.report._write_position_cache(cachefile)
+        self.assertEqual(os.listdir(self.cachedir),
+                         [os.path.basename(cachefile)])
+        self.assertEqual(self.report._read_position_cache(cachefile),
+                         self.report.pos)
+
+    def test_unusable_cache_file_is_ignored(self):
+        cachefile = self.report._position_cache_file()
+        for contents in (b'', b'\x93NUMPY', b'\x80\x04N.'):
+            with open(cachefile, 'wb') as positionfile:
+                positionfile.write(contents)
+            self.assertIsNone(self.report._read_position_cache(cachefile))
+
+    def test_oldest_cache_files_are_removed(self):
+        self.report.positioncachesize = 2
+        for i in range(3):
+            cachefile = os.path.join(self.cachedir,
+                                     'pos_{0}_spring.npy'.format(i))
+            self.report._write_position_cache(cachefile)
+            os.utime(cachefile, (i, i))
+        self.report._write_position_cache(
+            self.report._position_cache_file())
+        self.assertEqual(len(os.listdir(self.cachedir)), 2)
+        self.assertNotIn('pos_0_spring.npy', os.listdir(self.cachedir))
+
+
+class _BrokenExecutor(object):
+    """A process pool whose workers always die."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def map(self, *args):
+        raise BrokenProcessPool('A child process terminated abruptly')
+
+
+class _FailingLayoutExecutor(_BrokenExecutor):
+    """A process pool whose workers fail to lay out the graph."""
+
+    def map(self, *args):
+        raise RuntimeError('The layout failed in a worker')
+
+
+class ComponentLayoutTests(unittest.TestCase):
+    """Tests for laying out the weakly connected components."""
+
+    def setUp(self):
+        self.report = _report([_process(1, 0)])
+        self.report.layoutalgo = 'spring'
+        self.graph = networkx.DiGraph()
+        for i in range(300):
+            self.graph.add_edge('A{0}'.format(i), 'B{0}'.format(i))
+        self.laidout = []
+
+    def _layout_component(self, graph, layoutalgo):
+        self.laidout.append(len(graph))
+        return dict((n, (float(i), 0.0)) for i, n in enumerate(graph))
+
+    def _layout(self, cpu_count, executor=_BrokenExecutor):
+        with mock.patch.object(reportmodule, '_layout_component',
+                               self._layout_component), \
+                mock.patch.object(reportmodule, 'ProcessPoolExecutor',
+                                  executor), \
+                mock.patch.object(reportmodule.multiprocessing, 'cpu_count',
+                                  cpu_count):
+            return self.report._layout_components(self.graph)
+
+    def test_broken_pool_falls_back_to_this_process(self):
+        pos = self._layout(lambda: 4)
+        self.assertEqual(self.laidout, [2] * 300)
+        self.assertEqual(set(pos), set(self.graph))
+
+    def test_unknown_cpu_count_falls_back_to_this_process(self):
+        def cpu_count():
+            raise NotImplementedError('cannot determine number of cpus')
+
+        pos = self._layout(cpu_count)
+        self.assertEqual(len(self.laidout), 300)
+        self.assertEqual(set(pos), set(self.graph))
+
+    def test_layout_errors_in_the_pool_are_not_retried(self):
+        self.assertRaises(RuntimeError, self._layout, lambda: 4,
+                          _FailingLayoutExecutor)
+        self.assertEqual(self.laidout, [])
+
+
+class _FakeForceAtlas2(object):
+    """A stand in for fa2's ForceAtlas2 that records its graphs."""
+
+    graphs = []
+
+    def __init__(self, verbose=True):
+        pass
+
+    def forceatlas2_networkx_layout(self, graph, pos=None, iterations=100):
+        self.graphs.append(graph)
+        return dict((n, (float(i), 1.0)) for i, n in enumerate(graph))
+
+
+class _BrokenForceAtlas2(_FakeForceAtlas2):
+    """A stand in for fa2's ForceAtlas2 on networkx 3."""
+
+    def forceatlas2_networkx_layout(self, graph, pos=None, iterations=100):
+        self.graphs.append(graph)
+        raise AttributeError("module 'networkx' has no attribute "
+                             "'to_scipy_sparse_matrix'")
+
+
+class ForceAtlas2Tests(unittest.TestCase):
+    """Tests for choosing and running the ForceAtlas2 layout."""
+
+    def setUp(self):
+        self.report = _report([_process(1, 0)])
+        self.graph = networkx.DiGraph(networkx.path_graph(10))
+        _FakeForceAtlas2.graphs = []
+
+    def test_large_graphs_default_to_forceatlas2(self):
+        with mock.patch.object(reportmodule, 'ForceAtlas2',
+                               _FakeForceAtlas2):
+            self.assertEqual(self.report._layoutalgorithm(range(500)),
+                             'forceatlas2')
+            self.assertEqual(self.report._layoutalgorithm(range(499)),
+                             'spring')
+            self.report.layoutalgo = 'spring'
+            self.assertEqual(self.report._layoutalgorithm(range(500)),
+                             'spring')
+
+        with mock.patch.object(reportmodule, 'ForceAtlas2', None):
+            self.report.layoutalgo = None
+            self.assertEqual(self.report._layoutalgorithm(range(500)),
+                             'spring')
+
+    def test_fa2_lays_out_undirected_graph(self):
+        with mock.patch.object(reportmodule, 'ForceAtlas2',
+                               _FakeForceAtlas2):
+            pos = reportmodule._layout_component(self.graph, 'forceatlas2')
+        self.assertEqual(len(_FakeForceAtlas2.graphs), 1)
+        self.assertFalse(_FakeForceAtlas2.graphs[0].is_directed())
+        self.assertEqual(pos[0], (0.0, 1.0))
+
+    def test_failing_fa2_falls_back_to_spring(self):
+        with mock.patch.object(reportmodule, 'ForceAtlas2',
+                               _BrokenForceAtlas2):
+            pos = reportmodule._layout_component(self.graph, 'forceatlas2')
+        self.assertEqual(len(_FakeForceAtlas2.graphs), 1)
+        self.assertEqual(set(pos), set(self.graph))
+
+
+class NodeMetadataTests(unittest.TestCase):
+    """Tests that the node metadata can be used as dicts."""
+
+    def test_metadata_is_a_dict(self):
+        metadata = _FileEventMetadata(node_type='FILEWRITE',
+                                      file='C:\\a.txt')
+        self.assertIsInstance(metadata, dict)
+        self.assertEqual(metadata, {'node_type': 'FILEWRITE',
+                                    'file': 'C:\\a.txt'})
+        self.assertIsNone(metadata.get('timestamp'))
+        self.assertRaises(AttributeError, setattr, metadata, 'file', '')
+
+    def test_report_metadata_is_json_serializable(self):
+        report = _report([_process(1, 0, [_process(2, 1)])])
+        nodemetadata = json.loads(json.dumps(report.nodemetadata))
+        self.assertEqual(nodemetadata['PID 2']['parent_id'], 1)
+        self.assertEqual(nodemetadata['PID 1']['children'], ['PID 2'])
+
+
+if __name__ == '__main__':
+    unittest.main()